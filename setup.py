@@ -6,4 +6,10 @@ setup(
     install_requires=[
         "pygame-ce >= 2.5",
     ],
+    extras_require={
+        # for ModeBase._COLLISION_VECTORIZE_CIRCLES
+        "numpy": [
+            "numpy",
+        ],
+    },
 )
@@ -2,7 +2,9 @@ from .saveable import Saveable
 from .animsprite import AnimSprite
 from .gamesprite import GameSprite
 from .gameinput import InputType, InputDefault, EVENT_TYPE_START_POS
-from .modebase import ModeBase
+from .modebase import ModeBase, UpdatePolicy
+from .collisionstats import CollisionStats
+from .framescheduler import FramePolicy, FrameScheduler
 from .fontwrap import FontWrap, get_default_font_wrap
 from . import load
 from . import utility
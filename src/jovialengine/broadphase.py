@@ -0,0 +1,232 @@
+import math
+from typing import TYPE_CHECKING
+from collections.abc import Sequence
+
+if TYPE_CHECKING:
+    from .gamesprite import GameSprite
+
+
+def get_bounds(sprite: GameSprite):
+    """Gets the area a sprite can collide within, as (left, top, right, bottom)."""
+    # rounding so that bounds reflect apparent (drawn) position of sprites, same as collision checks
+    left = round(sprite.rect.x)
+    top = round(sprite.rect.y)
+    right = left + sprite.rect.width
+    bottom = top + sprite.rect.height
+    if sprite.radius:
+        # circle collisions use the unrounded center, and the radius can reach past the rect
+        centerx, centery = sprite.rect.center
+        left = min(left, centerx - sprite.radius)
+        top = min(top, centery - sprite.radius)
+        right = max(right, centerx + sprite.radius)
+        bottom = max(bottom, centery + sprite.radius)
+    return left, top, right, bottom
+
+
+class SpatialHash(object):
+    """Uniform grid broadphase.
+    Only pairs of sprites that share at least one cell are returned as possible collisions."""
+    __slots__ = (
+        '_cell_size',
+    )
+
+    def __init__(self, cell_size: int):
+        if cell_size < 1:
+            raise ValueError("error: cell_size must be positive")
+        self._cell_size = cell_size
+
+    def get_pairs(self, sprites: Sequence[GameSprite]):
+        """Get pairs of sprites that might collide.
+        Pairs are ordered as they would be by looping over every pair of sprites in order."""
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, sprite in enumerate(sprites):
+            left, top, right, bottom = get_bounds(sprite)
+            for cell_x in range(math.floor(left / self._cell_size), math.floor(right / self._cell_size) + 1):
+                for cell_y in range(math.floor(top / self._cell_size), math.floor(bottom / self._cell_size) + 1):
+                    cell = cells.get((cell_x, cell_y))
+                    if cell is None:
+                        cells[(cell_x, cell_y)] = [i]
+                    else:
+                        cell.append(i)
+        index_pairs: set[tuple[int, int]] = set()
+        for cell in cells.values():
+            for k, i in enumerate(cell):
+                for j in cell[k + 1:]:
+                    index_pairs.add((i, j))
+        return [
+            (sprites[i], sprites[j])
+            for i, j
+            in sorted(index_pairs)
+        ]
+
+
+class SweepAndPrune(object):
+    """Sweep and prune broadphase along one axis.
+    The intervals sprites cover on that axis are kept sorted between steps,
+    so sprites that move coherently only need a few insertion sort swaps to stay in order.
+    Only pairs of sprites whose intervals overlap on both axes are returned as possible collisions."""
+    __slots__ = (
+        '_axis',
+        '_intervals',
+    )
+
+    def __init__(self, axis: int):
+        if axis not in (0, 1):
+            raise ValueError("error: axis must be 0 (x) or 1 (y)")
+        self._axis = axis
+        # each interval is [start, end, other_start, other_end, sprite]
+        self._intervals: list[list] = []
+
+    def get_pairs(self, sprites: Sequence[GameSprite]):
+        """Get pairs of sprites that might collide.
+        Pairs are ordered as they would be by looping over every pair of sprites in order."""
+        indexes = {
+            sprite: i
+            for i, sprite
+            in enumerate(sprites)
+        }
+        intervals = [
+            interval
+            for interval
+            in self._intervals
+            if interval[4] in indexes
+        ]
+        kept = {
+            interval[4]
+            for interval
+            in intervals
+        }
+        intervals.extend(
+            [0, 0, 0, 0, sprite]
+            for sprite
+            in sprites
+            if sprite not in kept
+        )
+        for interval in intervals:
+            left, top, right, bottom = get_bounds(interval[4])
+            if self._axis == 0:
+                interval[:4] = left, right, top, bottom
+            else:
+                interval[:4] = top, bottom, left, right
+        # insertion sort, close to linear since the order rarely changes much between steps
+        for k in range(1, len(intervals)):
+            interval = intervals[k]
+            j = k - 1
+            while j >= 0 and intervals[j][0] > interval[0]:
+                intervals[j + 1] = intervals[j]
+                j -= 1
+            intervals[j + 1] = interval
+        self._intervals = intervals
+        index_pairs: list[tuple[int, int]] = []
+        active: list[list] = []
+        for interval in intervals:
+            active = [
+                other
+                for other
+                in active
+                if other[1] >= interval[0]
+            ]
+            i = indexes[interval[4]]
+            for other in active:
+                if other[2] <= interval[3] and interval[2] <= other[3]:
+                    j = indexes[other[4]]
+                    index_pairs.append((i, j) if i < j else (j, i))
+            active.append(interval)
+        return [
+            (sprites[i], sprites[j])
+            for i, j
+            in sorted(index_pairs)
+        ]
+
+
+class RectIndex(object):
+    """Uniform grid of sprites that can be added to and removed from incrementally.
+    Used to find the sprites that might collide within an area without checking every sprite."""
+    __slots__ = (
+        '_cell_size',
+        '_cells',
+        '_sprite_cells',
+    )
+
+    def __init__(self, cell_size: int):
+        if cell_size < 1:
+            raise ValueError("error: cell_size must be positive")
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[GameSprite]] = {}
+        self._sprite_cells: dict[GameSprite, list[tuple[int, int]]] = {}
+
+    def _get_cells(self, bounds: tuple[float, float, float, float]):
+        return [
+            (cell_x, cell_y)
+            for cell_x in range(math.floor(bounds[0] / self._cell_size), math.floor(bounds[2] / self._cell_size) + 1)
+            for cell_y in range(math.floor(bounds[1] / self._cell_size), math.floor(bounds[3] / self._cell_size) + 1)
+        ]
+
+    def add(self, sprite: GameSprite):
+        """Add a sprite at its current bounds, moving it if it was already added."""
+        cells = self._get_cells(get_bounds(sprite))
+        old_cells = self._sprite_cells.get(sprite, None)
+        if old_cells is not None:
+            if old_cells == cells:
+                return
+            self.remove(sprite)
+        self._sprite_cells[sprite] = cells
+        for cell in cells:
+            cell_sprites = self._cells.get(cell)
+            if cell_sprites is None:
+                self._cells[cell] = {sprite}
+            else:
+                cell_sprites.add(sprite)
+
+    def remove(self, sprite: GameSprite):
+        for cell in self._sprite_cells.pop(sprite):
+            cell_sprites = self._cells[cell]
+            cell_sprites.discard(sprite)
+            if not cell_sprites:
+                del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._sprite_cells.clear()
+
+    def sprites(self):
+        return list(self._sprite_cells)
+
+    def query(self, bounds: tuple[float, float, float, float]):
+        """Get the sprites in cells touching the bounds (left, top, right, bottom), in no particular order."""
+        result: set[GameSprite] = set()
+        for cell in self._get_cells(bounds):
+            cell_sprites = self._cells.get(cell)
+            if cell_sprites:
+                result.update(cell_sprites)
+        return result
+
+    def query_line(self, start: tuple[float, float], end: tuple[float, float]):
+        """Get the sprites in cells the line from start to end passes through, in no particular order."""
+        x0 = start[0] / self._cell_size
+        y0 = start[1] / self._cell_size
+        x1 = end[0] / self._cell_size
+        y1 = end[1] / self._cell_size
+        cell_x = math.floor(x0)
+        cell_y = math.floor(y0)
+        dx = x1 - x0
+        dy = y1 - y0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # distance along the line (0 to 1) to the next cell boundary, and between cell boundaries, for each axis
+        next_x = ((cell_x + (step_x > 0)) - x0) / dx if dx else math.inf
+        next_y = ((cell_y + (step_y > 0)) - y0) / dy if dy else math.inf
+        delta_x = abs(1 / dx) if dx else math.inf
+        delta_y = abs(1 / dy) if dy else math.inf
+        result: set[GameSprite] = set()
+        for _ in range(abs(math.floor(x1) - cell_x) + abs(math.floor(y1) - cell_y) + 1):
+            cell_sprites = self._cells.get((cell_x, cell_y))
+            if cell_sprites:
+                result.update(cell_sprites)
+            if next_x < next_y:
+                cell_x += step_x
+                next_x += delta_x
+            else:
+                cell_y += step_y
+                next_y += delta_y
+        return result
@@ -0,0 +1,110 @@
+import math
+
+import pygame
+
+
+class ChunkedBackground(object):
+    """A background split into fixed-size chunks.
+    Chunks are only allocated once something is drawn onto them, the rest are drawn as the fill color,
+    so a solid color background doesn't allocate any surfaces.
+    Drawing only blits the chunks within the area being drawn."""
+    __slots__ = (
+        '_size',
+        '_chunk_size',
+        '_color',
+        '_chunks',
+    )
+
+    def __init__(self, size: tuple[int, int], chunk_size: int, color: pygame.typing.ColorLike = (0, 0, 0)):
+        if chunk_size < 1:
+            raise ValueError("error: chunk_size must be positive")
+        self._size = size
+        self._chunk_size = chunk_size
+        self._color = pygame.Color(color)
+        self._chunks: dict[tuple[int, int], pygame.Surface] = dict()
+
+    def get_size(self):
+        return self._size
+
+    def get_chunk_count(self):
+        """Get the number of chunks that have been allocated."""
+        return len(self._chunks)
+
+    def _get_chunk(self, chunk_pos: tuple[int, int]):
+        chunk = self._chunks.get(chunk_pos, None)
+        if chunk is None:
+            chunk = pygame.Surface((
+                min(self._chunk_size, self._size[0] - chunk_pos[0] * self._chunk_size),
+                min(self._chunk_size, self._size[1] - chunk_pos[1] * self._chunk_size),
+            )).convert()
+            chunk.fill(self._color)
+            self._chunks[chunk_pos] = chunk
+        return chunk
+
+    def _get_chunk_positions(self, rect: pygame.Rect):
+        rect = rect.clip((0, 0), self._size)
+        if not rect:
+            return []
+        return [
+            (chunk_x, chunk_y)
+            for chunk_y in range(rect.top // self._chunk_size, math.ceil(rect.bottom / self._chunk_size))
+            for chunk_x in range(rect.left // self._chunk_size, math.ceil(rect.right / self._chunk_size))
+        ]
+
+    def set_chunk(self, chunk_pos: tuple[int, int], chunk: pygame.Surface):
+        """Replace the chunk at a chunk position (in chunks, not pixels)."""
+        self._chunks[chunk_pos] = chunk
+
+    def remove_chunk(self, chunk_pos: tuple[int, int]):
+        """Free the chunk at a chunk position (in chunks, not pixels), so it is drawn as the fill color."""
+        self._chunks.pop(chunk_pos, None)
+
+    def fill(self, color: pygame.typing.ColorLike):
+        """Fill the whole background with a color, freeing all chunks."""
+        self._color = pygame.Color(color)
+        self._chunks.clear()
+
+    def get_at(self, pos: tuple[int, int]):
+        if not (0 <= pos[0] < self._size[0] and 0 <= pos[1] < self._size[1]):
+            raise IndexError("error: position out of bounds")
+        chunk = self._chunks.get((pos[0] // self._chunk_size, pos[1] // self._chunk_size), None)
+        if chunk is None:
+            return pygame.Color(self._color)
+        return chunk.get_at((pos[0] % self._chunk_size, pos[1] % self._chunk_size))
+
+    def set_at(self, pos: tuple[int, int], color: pygame.typing.ColorLike):
+        if not (0 <= pos[0] < self._size[0] and 0 <= pos[1] < self._size[1]):
+            return
+        chunk = self._get_chunk((pos[0] // self._chunk_size, pos[1] // self._chunk_size))
+        chunk.set_at((pos[0] % self._chunk_size, pos[1] % self._chunk_size), color)
+
+    def blit(
+            self,
+            source: pygame.Surface,
+            dest: pygame.typing.Point,
+            area: pygame.typing.RectLike | None = None
+    ):
+        """Draw a surface onto the background, like Surface.blit."""
+        source_size = pygame.Rect(area).size if area else source.get_size()
+        dest = (round(dest[0]), round(dest[1]))
+        for chunk_pos in self._get_chunk_positions(pygame.Rect(dest, source_size)):
+            chunk = self._get_chunk(chunk_pos)
+            chunk.blit(
+                source,
+                (dest[0] - chunk_pos[0] * self._chunk_size, dest[1] - chunk_pos[1] * self._chunk_size),
+                area
+            )
+
+    def draw(self, screen: pygame.Surface, offset: pygame.typing.IntPoint, area: pygame.Rect):
+        """Draw the part of the background within an area of the screen, with the background offset by some amount."""
+        visible = area.clip(pygame.Rect(offset, self._size))
+        if not visible:
+            return
+        screen.fill(self._color, visible)
+        for chunk_pos in self._get_chunk_positions(visible.move(-offset[0], -offset[1])):
+            chunk = self._chunks.get(chunk_pos, None)
+            if chunk is not None:
+                screen.blit(
+                    chunk,
+                    (offset[0] + chunk_pos[0] * self._chunk_size, offset[1] + chunk_pos[1] * self._chunk_size)
+                )
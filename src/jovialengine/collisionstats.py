@@ -0,0 +1,53 @@
+class CollisionStats(object):
+    """Counters for the collision checks a mode does, added to on every update step until reset.
+    Times are in nanoseconds.
+    pairs_considered: pairs of sprites found by the broadphase (or by class) as possible collisions
+    pairs_filtered: pairs found by the broadphase then skipped because neither sprite is interested in the other's
+        collision labels, without a broadphase pairs are only formed between classes interested in each other,
+        so uninterested pairs are never counted here (or in pairs_considered) and this stays 0
+    circle_checks, mask_checks, rect_checks: narrowphase checks done, by type of check
+    hits: pairs of sprites found colliding
+    static_checks, static_hits: checks and collisions against static collision masks
+    static_time, broadphase_time, narrowphase_time, events_time: time spent in each phase of collision handling
+    """
+    __slots__ = (
+        'steps',
+        'pairs_considered',
+        'pairs_filtered',
+        'circle_checks',
+        'mask_checks',
+        'rect_checks',
+        'hits',
+        'static_checks',
+        'static_hits',
+        'static_time',
+        'broadphase_time',
+        'narrowphase_time',
+        'events_time',
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Set all counters back to zero."""
+        self.steps = 0
+        self.pairs_considered = 0
+        self.pairs_filtered = 0
+        self.circle_checks = 0
+        self.mask_checks = 0
+        self.rect_checks = 0
+        self.hits = 0
+        self.static_checks = 0
+        self.static_hits = 0
+        self.static_time = 0
+        self.broadphase_time = 0
+        self.narrowphase_time = 0
+        self.events_time = 0
+
+    def as_dict(self):
+        return {
+            name: getattr(self, name)
+            for name
+            in self.__slots__
+        }
@@ -3,9 +3,13 @@ import configparser
 
 FULLSCREEN = 'Fullscreen'
 SCREEN_SCALE = 'ScreenScale'
+RENDERER = 'Renderer'
+RENDER_THREAD = 'RenderThread'
 _DEFAULTS = {
     SCREEN_SCALE: 0,
     FULLSCREEN: False,
+    RENDERER: False,
+    RENDER_THREAD: False,
 }
 _SECTION = 'Game'
 _config = configparser.ConfigParser(_DEFAULTS, default_section=_SECTION)
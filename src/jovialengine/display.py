@@ -1,7 +1,14 @@
 import os
 import math
+import time
+import queue
+import threading
 
 import pygame
+try:
+    from pygame._sdl2 import video as sdl2_video
+except ImportError:
+    sdl2_video = None
 
 from . import config
 from . import utility
@@ -23,8 +30,29 @@ _disp_res: tuple[int, int]
 screen: pygame.Surface | None = None
 _fullscreen_offset: tuple[int, int] | None
 _full_screen: pygame.Surface | None
-_disp_screen: pygame.Surface
+_disp_screen: pygame.Surface | None
+# used instead of _disp_screen and _full_screen when presenting through an SDL renderer
+_use_renderer: bool = False
+_window: sdl2_video.Window | None = None
+_renderer: sdl2_video.Renderer | None = None
+_texture: sdl2_video.Texture | None = None
 max_framerate: int = 0
+# used with config.RENDER_THREAD, frames are copied to _present_screen and scaled onto _scaled_screen on
+# _present_thread, then _scaled_screen is copied to the display and flipped back on the main thread,
+# as SDL video calls (and the display surface) aren't safe to use from other threads on every platform
+_use_render_thread: bool = False
+_present_screen: pygame.Surface | None = None
+_scaled_screen: pygame.Surface | None = None
+# the screen rects and input time of the frame being scaled, waiting to be flipped
+_present_pending: tuple[list[pygame.Rect] | None, int | None] | None = None
+_present_thread: threading.Thread | None = None
+_present_requests: queue.SimpleQueue = queue.SimpleQueue()
+_present_idle = threading.Event()
+_present_idle.set()
+_present_error: Exception | None = None
+_latency_last: int = 0
+_latency_total: int = 0
+_latency_frames: int = 0
 
 
 def init(
@@ -48,6 +76,8 @@ def init(
     global _upscale_max
     global _windowed_flags
     global _fullscreen_flags
+    global _use_renderer
+    global _use_render_thread
     if screen:
         raise RuntimeError("error: screen is already set")
     _screenshot_directory = screenshot_directory
@@ -79,6 +109,9 @@ def init(
         _fullscreen_flags = pygame.NOFRAME
     _fullscreen_offset = None
     _full_screen = None
+    _use_renderer = config.get(config.RENDERER) and sdl2_video is not None
+    # an SDL renderer can only be used from the thread that created it
+    _use_render_thread = config.get(config.RENDER_THREAD) and not _use_renderer
     is_fullscreen = config.get(config.FULLSCREEN)
     upscale = 0
     target_scale = config.get(config.SCREEN_SCALE)
@@ -94,6 +127,7 @@ def set_scale(new_scale: int):
     new_scale = pygame.math.clamp(new_scale, 1, _upscale_max)
     if new_scale == upscale:
         return
+    finish_present()
     upscale = new_scale
     _disp_res = (
         screen_size[0] * upscale,
@@ -102,10 +136,10 @@ def set_scale(new_scale: int):
     if is_fullscreen:
         _set_fullscreen()
     else:
-        pygame.display.quit()
-        pygame.display.init()
+        _reset_display()
         _set_windowed()
     screen = screen.convert()
+    _reset_present()
     config.update(config.SCREEN_SCALE, upscale)
 
 
@@ -116,17 +150,33 @@ def change_scale(scale_change: int):
 def toggle_fullscreen():
     global is_fullscreen
     global screen
+    finish_present()
     is_fullscreen = not is_fullscreen
-    pygame.display.quit()
-    pygame.display.init()
+    _reset_display()
     if is_fullscreen:
         _set_fullscreen()
     else:
         _set_windowed()
     screen = screen.convert()
+    _reset_present()
     config.update(config.FULLSCREEN, is_fullscreen)
 
 
+def _reset_display():
+    """Close the window so it can be opened again with different settings."""
+    global _window
+    global _renderer
+    global _texture
+    if _window is not None:
+        _texture = None
+        _renderer = None
+        _window.destroy()
+        _window = None
+    else:
+        pygame.display.quit()
+        pygame.display.init()
+
+
 def _set_windowed():
     global _fullscreen_offset
     global _full_screen
@@ -134,9 +184,13 @@ def _set_windowed():
     # center window
     x = (_monitor_res[0] - _disp_res[0]) // 2
     y = (_monitor_res[1] - _disp_res[1]) // 2
-    os.environ['SDL_VIDEO_WINDOW_POS'] = f'{x},{y}'
     _fullscreen_offset = None
     _full_screen = None
+    if _use_renderer:
+        _disp_screen = None
+        _set_window(_disp_res, (x, y), False)
+        return
+    os.environ['SDL_VIDEO_WINDOW_POS'] = f'{x},{y}'
     _disp_screen = _set_mode(_disp_res, _windowed_flags)
 
 
@@ -148,12 +202,17 @@ def _set_fullscreen():
         (_monitor_res[0] - _disp_res[0]) // 2,
         (_monitor_res[1] - _disp_res[1]) // 2,
     )
+    if _use_renderer:
+        _disp_screen = None
+        if _window is None:
+            _set_window(_monitor_res, (0, 0), True)
+        return
     if _full_screen is None:
         os.environ['SDL_VIDEO_WINDOW_POS'] = '0,0'
         _full_screen = _set_mode(_monitor_res, _fullscreen_flags)
-    else:
-        _full_screen.fill((0, 0, 0))
-    _disp_screen = pygame.Surface(_disp_res).convert()
+    # the borders are only painted here, frames are scaled straight into the centered area
+    _full_screen.fill((0, 0, 0))
+    _disp_screen = _full_screen.subsurface((_fullscreen_offset, _disp_res))
 
 
 def _set_mode(size: tuple[int, int], flags: int):
@@ -174,12 +233,194 @@ def _set_mode(size: tuple[int, int], flags: int):
     return display
 
 
-def scale_draw():
-    """Scale screen onto display surface, then flip the display."""
-    pygame.transform.scale(screen, _disp_res, _disp_screen)
-    if is_fullscreen:
-        _full_screen.blit(_disp_screen, _fullscreen_offset)
-    pygame.display.flip()
+def _set_window(size: tuple[int, int], position: tuple[int, int], fullscreen: bool):
+    global _window
+    global _renderer
+    global _texture
+    global max_framerate
+    if pygame.display.get_surface() is None:
+        # surfaces are still converted to the format of the display module, so it needs a (hidden) mode
+        pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    _window = sdl2_video.Window(_title, size, position, fullscreen_desktop=fullscreen)
+    if _window_icon:
+        _window.set_icon(_window_icon)
+    try:
+        _renderer = sdl2_video.Renderer(_window, vsync=True)
+    except pygame.error:
+        _renderer = sdl2_video.Renderer(_window)
+    _renderer.draw_color = (0, 0, 0, 255)
+    _texture = sdl2_video.Texture(_renderer, screen_size, streaming=True)
+    max_framerate = max(pygame.display.get_desktop_refresh_rates())
+    if not _mouse_visible:
+        pygame.mouse.set_visible(False)
+
+
+def _present_renderer(rects: list[pygame.Rect] | None):
+    if rects is None:
+        _texture.update(screen)
+    else:
+        for rect in rects:
+            _texture.update(screen.subsurface(rect), rect)
+    # the renderer's back buffer isn't kept between frames, so the whole texture is drawn every time
+    _renderer.clear()
+    _texture.draw(dstrect=(_fullscreen_offset or (0, 0), _disp_res))
+    _renderer.present()
+
+
+def _get_disp_rect(rect: pygame.Rect):
+    return pygame.Rect(rect.x * upscale, rect.y * upscale, rect.width * upscale, rect.height * upscale)
+
+
+def _scale(source: pygame.Surface, target: pygame.Surface, rects: list[pygame.Rect] | None):
+    if rects is None:
+        pygame.transform.scale(source, _disp_res, target)
+        return
+    for rect in rects:
+        disp_rect = _get_disp_rect(rect)
+        pygame.transform.scale(source.subsurface(rect), disp_rect.size, target.subsurface(disp_rect))
+
+
+def _flip(rects: list[pygame.Rect] | None):
+    if rects is None:
+        pygame.display.flip()
+        return
+    update_rects = []
+    for rect in rects:
+        disp_rect = _get_disp_rect(rect)
+        if is_fullscreen:
+            disp_rect.move_ip(_fullscreen_offset)
+        update_rects.append(disp_rect)
+    pygame.display.update(update_rects)
+
+
+def _record_latency(input_time: int | None):
+    global _latency_last
+    global _latency_total
+    global _latency_frames
+    if input_time is None:
+        return
+    latency = time.perf_counter_ns() - input_time
+    _latency_last = latency
+    _latency_total += latency
+    _latency_frames += 1
+
+
+def _work(requests: queue.SimpleQueue):
+    global _present_error
+    while True:
+        rects = requests.get()
+        if rects is False:
+            return
+        try:
+            # only software surfaces are touched here, never the display
+            _scale(_present_screen, _scaled_screen, rects)
+        except Exception as e:
+            _present_error = e
+        _present_idle.set()
+
+
+def finish_present():
+    """With config.RENDER_THREAD set, wait for the present thread to be done scaling the last frame,
+    then copy it to the display and flip. Otherwise, frames are already presented by scale_draw()."""
+    global _present_error
+    global _present_pending
+    _present_idle.wait()
+    if _present_error is not None:
+        error = _present_error
+        _present_error = None
+        _present_pending = None
+        raise error
+    if _present_pending is None:
+        return
+    rects, input_time = _present_pending
+    _present_pending = None
+    if rects is None:
+        _disp_screen.blit(_scaled_screen, (0, 0))
+    else:
+        for rect in rects:
+            disp_rect = _get_disp_rect(rect)
+            _disp_screen.blit(_scaled_screen, disp_rect, disp_rect)
+    _flip(rects)
+    _record_latency(input_time)
+
+
+def _reset_present():
+    """Drop the surfaces used by the present thread, so they are made again to match the display."""
+    global _present_screen
+    global _scaled_screen
+    _present_screen = None
+    _scaled_screen = None
+
+
+def _start_present(rects: list[pygame.Rect] | None, input_time: int | None):
+    global _present_screen
+    global _scaled_screen
+    global _present_thread
+    global _present_pending
+    finish_present()
+    if _present_screen is None or _present_screen.get_size() != screen.get_size():
+        _present_screen = screen.copy()
+        _scaled_screen = pygame.Surface(_disp_res, 0, _disp_screen)
+        rects = None
+    elif rects is None:
+        _present_screen.blit(screen, (0, 0))
+    else:
+        for rect in rects:
+            _present_screen.blit(screen, rect, rect)
+    if _present_thread is None:
+        _present_thread = threading.Thread(target=_work, args=(_present_requests,), daemon=True)
+        _present_thread.start()
+    _present_pending = (rects, input_time)
+    _present_idle.clear()
+    _present_requests.put(rects)
+
+
+def scale_draw(rects: list[pygame.Rect] | None = None, input_time: int | None = None):
+    """Scale screen onto display surface, then flip the display.
+    If rects is set, only those areas of the screen are scaled and updated on the display.
+    If input_time is set (from time.perf_counter_ns), the time until the frame is presented counts towards latency.
+    With config.RENDERER set, screen is instead uploaded to a texture that SDL scales when presenting.
+    With config.RENDER_THREAD set, screen is copied and the copy is scaled on another thread while the next frame
+    is made, then flipped on the next call (or finish_present()), so frames are shown one call later."""
+    if _use_render_thread:
+        _start_present(rects, input_time)
+        return
+    if _renderer is not None:
+        _present_renderer(rects)
+    else:
+        _scale(screen, _disp_screen, rects)
+        _flip(rects)
+    _record_latency(input_time)
+
+
+def get_input_latency():
+    """Get the time in nanoseconds from reading input to presenting the frame made with it,
+    for the last frame presented and averaged over frames presented since reset_input_latency()."""
+    if not _latency_frames:
+        return 0, 0
+    return _latency_last, _latency_total // _latency_frames
+
+
+def reset_input_latency():
+    global _latency_last
+    global _latency_total
+    global _latency_frames
+    _latency_last = 0
+    _latency_total = 0
+    _latency_frames = 0
+
+
+def stop():
+    """Present the last frame, then stop the present thread if there is one."""
+    global _present_thread
+    global _present_requests
+    finish_present()
+    if _present_thread is not None:
+        _present_requests.put(False)
+        _present_thread.join()
+        _present_thread = None
+    _present_requests = queue.SimpleQueue()
+    _reset_present()
 
 
 def scale_mouse_input(event: pygame.event.Event):
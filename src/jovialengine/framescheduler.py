@@ -0,0 +1,124 @@
+import enum
+import time
+from collections.abc import Callable
+
+
+class FramePolicy(enum.Enum):
+    BUSY = enum.auto()
+    HYBRID = enum.auto()
+    SLEEP = enum.auto()
+
+
+class FrameScheduler(object):
+    """Waits out the rest of each frame to keep to a framerate, like pygame.time.Clock.
+    BUSY spins for the whole wait, like Clock.tick_busy_loop, keeping a core busy but waking up right on time.
+    SLEEP sleeps for the whole wait, using almost no CPU but waking up late by however much the OS oversleeps.
+    HYBRID sleeps for most of the wait and spins for the rest, adjusting how long it spins so frames are at most
+    jitter_target milliseconds late.
+    Times are in milliseconds, as floats except for the dt returned by tick().
+    get_time and sleep stand in for time.perf_counter_ns and time.sleep, so a fake clock can be used."""
+    # spin times are kept in nanoseconds
+    _MIN_SPIN_TIME = 100_000
+    _MAX_SPIN_TIME = 4_000_000
+
+    __slots__ = (
+        'policy',
+        '_get_time',
+        '_sleep',
+        '_jitter_target',
+        '_spin_time',
+        '_last_time',
+        '_frame_end',
+        '_frames',
+        '_jitter_total',
+        '_jitter_max',
+    )
+
+    def __init__(
+            self,
+            policy: FramePolicy = FramePolicy.HYBRID,
+            jitter_target: float = 0.5,
+            get_time: Callable[[], int] = time.perf_counter_ns,
+            sleep: Callable[[float], None] = time.sleep
+    ):
+        self.policy = policy
+        self._get_time = get_time
+        self._sleep = sleep
+        self._jitter_target = 0
+        self.set_jitter_target(jitter_target)
+        self._spin_time = self._MAX_SPIN_TIME // 2
+        self._last_time = self._get_time()
+        # when the current frame should end, to keep frames to the framerate without drifting
+        self._frame_end: int | None = None
+        self.reset_jitter()
+
+    def reset_jitter(self):
+        self._frames = 0
+        self._jitter_total = 0
+        self._jitter_max = 0
+
+    def get_jitter(self):
+        """Get how late waits ended, on average and at most, over frames waited out since reset_jitter()."""
+        if not self._frames:
+            return 0.0, 0.0
+        return self._jitter_total / self._frames / 1_000_000, self._jitter_max / 1_000_000
+
+    def get_jitter_target(self):
+        return self._jitter_target / 1_000_000
+
+    def set_jitter_target(self, jitter_target: float):
+        self._jitter_target = round(jitter_target * 1_000_000)
+
+    def get_spin_time(self):
+        """Get how long HYBRID currently spins for at the end of each frame."""
+        return self._spin_time / 1_000_000
+
+    def tick(self, framerate: int = 0):
+        """Wait until the current frame should end (if framerate is set),
+        then return the number of milliseconds since the last call, like Clock.tick."""
+        if framerate > 0:
+            self.__wait(1_000_000_000 // framerate)
+        else:
+            self._frame_end = None
+        now = self._get_time()
+        dt = (now - self._last_time) // 1_000_000
+        # the leftover fraction of a millisecond counts towards the next frame
+        self._last_time += dt * 1_000_000
+        return dt
+
+    def __wait(self, frame_time: int):
+        now = self._get_time()
+        if self._frame_end is None or now - self._frame_end > frame_time:
+            # too far behind to catch up, so start counting frames from here
+            self._frame_end = now - frame_time
+        frame_end = self._frame_end + frame_time
+        self._frame_end = frame_end
+        if frame_end <= now:
+            # the frame itself ran late, so there is nothing to wait out
+            return
+        match self.policy:
+            case FramePolicy.BUSY:
+                self.__spin(frame_end)
+            case FramePolicy.SLEEP:
+                self.__sleep(frame_end - now)
+            case FramePolicy.HYBRID:
+                self.__sleep(frame_end - now - self._spin_time)
+                self.__spin(frame_end)
+        late = max(self._get_time() - frame_end, 0)
+        self._frames += 1
+        self._jitter_total += late
+        self._jitter_max = max(self._jitter_max, late)
+        if self.policy is FramePolicy.HYBRID:
+            if late > self._jitter_target:
+                self._spin_time = min(self._spin_time * 2, self._MAX_SPIN_TIME)
+            else:
+                self._spin_time = max(self._spin_time * 15 // 16, self._MIN_SPIN_TIME)
+
+    def __sleep(self, sleep_time: int):
+        if sleep_time > 0:
+            self._sleep(sleep_time / 1_000_000_000)
+
+    def __spin(self, frame_end: int):
+        while self._get_time() < frame_end:
+            # let other threads (like the render thread) run while spinning
+            self._sleep(0)
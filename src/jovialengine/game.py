@@ -1,4 +1,5 @@
 import os
+import time
 from types import ModuleType
 from collections.abc import Iterable
 
@@ -8,16 +9,19 @@ pygame.init()
 from . import display
 from . import gameinput
 from . import fontwrap
-from .modebase import ModeBase
+from .modebase import ModeBase, UpdatePolicy
 from .modegamemenu import ModeGameMenu
 from .modegamemenu import ModeGameMenuTop
 from .saveable import Saveable
+from .framescheduler import FramePolicy, FrameScheduler
 from . import config
 from . import save
 
 
 class Game(object):
     _AUTO_SAVE_NAME = "auto"
+    # loops per second while the window is minimized, for modes that don't wait for input anyway
+    _MINIMIZED_UPDATE_RATE = 10
 
     __slots__ = (
         'mode_module',
@@ -36,6 +40,10 @@ class Game(object):
         'font_height',
         'font_antialias',
         'max_dt',
+        'max_catch_up',
+        'fixed_dt',
+        'frame_policy',
+        'frame_jitter_target',
         'auto_save',
         'restart_affects_state',
         'mouse_visible',
@@ -45,7 +53,10 @@ class Game(object):
         'current_mode',
         '_running',
         '_is_first_loop',
-        '_clock',
+        '_is_minimized',
+        '_fixed_dt_time',
+        '_wait_time',
+        'frame_scheduler',
     )
 
     def __init__(self):
@@ -65,6 +76,10 @@ class Game(object):
         self.font_height: int | None = None
         self.font_antialias: bool | None = None
         self.max_dt: int = 5
+        self.max_catch_up: int = 250
+        self.fixed_dt: int | None = None
+        self.frame_policy: FramePolicy = FramePolicy.HYBRID
+        self.frame_jitter_target: float = 0.5
         self.auto_save: bool = False
         self.restart_affects_state: bool = True
         self.mouse_visible: bool = True
@@ -74,7 +89,12 @@ class Game(object):
         self.current_mode: ModeBase | None = None
         self._running: bool = False
         self._is_first_loop: bool = False
-        self._clock: pygame.time.Clock | None = None
+        self._is_minimized: bool = False
+        # with fixed_dt, time passed that hasn't been updated for yet
+        self._fixed_dt_time: int = 0
+        # how long the last _get_events() meant to wait for input
+        self._wait_time: int = 0
+        self.frame_scheduler: FrameScheduler | None = None
 
     def start(self):
         """Start the game, must be called before run()."""
@@ -135,7 +155,7 @@ class Game(object):
         self.current_mode = self.start_mode_cls()
         self._running = True
         self._is_first_loop = True
-        self._clock = pygame.time.Clock()
+        self.frame_scheduler = FrameScheduler(self.frame_policy, self.frame_jitter_target)
 
     def set_state(self, save_data=None):
         if save_data:
@@ -150,7 +170,8 @@ class Game(object):
         """Run the game, and check if the game needs to end."""
         if not self.current_mode:
             raise RuntimeError("error: self.current_mode is not set")
-        events = self._filter_input(pygame.event.get())
+        events = self._filter_input(self._get_events())
+        input_time = time.perf_counter_ns()
         events = gameinput.take_events(events)
         input_frame = gameinput.get_input_frame()
         if input_frame.was_player_input_pressed(0, gameinput.TYPE_SCREENSHOT):
@@ -165,13 +186,19 @@ class Game(object):
                 pygame.mixer.pause()
                 events = []
         self.current_mode.input(events, input_frame)
-        dt = self._clock.tick_busy_loop(display.max_framerate)
-        while dt > self.max_dt:
-            dt -= self.max_dt
-            self.current_mode.update(self.max_dt)
-        self.current_mode.update(dt)
-        self.current_mode.draw(display.screen)
-        display.scale_draw()
+        framerate = self._get_framerate()
+        dt = self.frame_scheduler.tick(framerate)
+        # time the loop meant to wait isn't catch-up time, so it is never dropped
+        planned_dt = max(self._wait_time, 1000 // framerate if framerate else 0)
+        alpha = self._update(dt, planned_dt)
+        if not self._is_minimized:
+            dirty_rects = self.current_mode.draw(display.screen, alpha)
+            # an empty list means nothing was redrawn, so the last frame presented is still current
+            if dirty_rects is None or dirty_rects:
+                display.scale_draw(dirty_rects, input_time)
+            else:
+                # a frame still being scaled on the render thread isn't presented until this is called
+                display.finish_present()
         if self.current_mode.next_mode is not None:
             if isinstance(self.current_mode, ModeGameMenu) \
                     and not isinstance(self.current_mode.next_mode, ModeGameMenu):
@@ -179,6 +206,8 @@ class Game(object):
                 pygame.mixer.unpause()
             self.current_mode.cleanup()
             self.current_mode = self.current_mode.next_mode
+            # the screen was last drawn by another mode
+            self.current_mode.invalidate()
             gameinput.start_new_mode()
             self._try_save()
         self._is_first_loop = False
@@ -188,9 +217,62 @@ class Game(object):
             self._try_save()
             self.current_mode = None
             self.state = None
+            display.stop()
             pygame.quit()
         return self._running
 
+    def _update(self, dt: int, planned_dt: int = 0):
+        """Update the current mode for dt milliseconds, in steps of at most max_dt, or exactly fixed_dt if set.
+        planned_dt is how long the frame was meant to take, including any time spent waiting for input.
+        Time more than max_catch_up past that is dropped rather than caught up on,
+        so a long hitch can't spiral into longer ones.
+        Returns how far through the next fixed_dt step the game is, from 0 to 1 (always 1 without fixed_dt)."""
+        max_dt_total = self.max_catch_up + planned_dt
+        if self.fixed_dt is None:
+            dt = min(dt, max_dt_total)
+            while dt > self.max_dt:
+                dt -= self.max_dt
+                self.current_mode.update(self.max_dt, False)
+            self.current_mode.update(dt)
+            return 1.0
+        self._fixed_dt_time = min(self._fixed_dt_time + dt, max(max_dt_total, self.fixed_dt))
+        steps = self._fixed_dt_time // self.fixed_dt
+        self._fixed_dt_time -= steps * self.fixed_dt
+        for step in range(steps):
+            self.current_mode.update(self.fixed_dt, step == steps - 1)
+        return self._fixed_dt_time / self.fixed_dt
+
+    def _get_events(self):
+        """Get events, first waiting for one if the current mode is EVENT_DRIVEN."""
+        self._wait_time = 0
+        if self.current_mode.get_update_policy() is not UpdatePolicy.EVENT_DRIVEN:
+            return pygame.event.get()
+        wait_time = self.current_mode.get_wait_time()
+        if wait_time is not None and wait_time <= 0:
+            return pygame.event.get()
+        if self.current_mode.is_draw_pending() and not self._is_minimized:
+            # a mode just switched to (or invalidated) has to be drawn before waiting, or the old frame stays up
+            return pygame.event.get()
+        # waiting however long it takes means nothing needs the time waited
+        self._wait_time = wait_time or 0
+        # the last frame needs to be on screen while waiting
+        display.finish_present()
+        # pygame.event.wait waits however long it takes for a timeout of 0
+        event = pygame.event.wait(wait_time or 0)
+        if event.type == pygame.NOEVENT:
+            return pygame.event.get()
+        return [event] + pygame.event.get()
+
+    def _get_framerate(self):
+        """Get the framerate to keep to for the current mode, or 0 for no limit."""
+        framerate = display.max_framerate
+        update_policy = self.current_mode.get_update_policy()
+        if update_policy is UpdatePolicy.THROTTLED:
+            framerate = self.current_mode.get_update_rate()
+        if self._is_minimized and update_policy is not UpdatePolicy.EVENT_DRIVEN:
+            framerate = min(framerate or self._MINIMIZED_UPDATE_RATE, self._MINIMIZED_UPDATE_RATE)
+        return framerate
+
     def _try_save(self):
         if self.auto_save and isinstance(self.current_mode, Saveable):
             new_save = save.Save.get_from_mode(self._AUTO_SAVE_NAME, self.current_mode)
@@ -216,6 +298,13 @@ class Game(object):
         match event.type:
             case pygame.MOUSEMOTION | pygame.MOUSEBUTTONUP | pygame.MOUSEBUTTONDOWN:
                 return display.is_in_screen(event.pos)
+            case pygame.WINDOWMINIMIZED:
+                # nothing is drawn while minimized, and modes are paused anyway
+                self._is_minimized = True
+            case pygame.WINDOWRESTORED | pygame.WINDOWMAXIMIZED:
+                if self._is_minimized:
+                    self._is_minimized = False
+                    self.current_mode.invalidate()
             case pygame.JOYDEVICEREMOVED:
                 self._joysticks = [
                     joystick
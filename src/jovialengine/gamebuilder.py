@@ -3,6 +3,7 @@ from types import ModuleType
 from .game import Game
 from .modebase import ModeBase
 from .saveable import Saveable
+from .framescheduler import FramePolicy
 from . import gameinput
 
 
@@ -102,6 +103,38 @@ class GameBuilder(object):
         self._game.max_dt = max_dt
         return self
 
+    def set_max_catch_up(self, max_catch_up: int):
+        """optional: Sets the most time in milliseconds the game catches up on in one frame.
+        After a long hitch, time past this amount (on top of how long the frame meant to take,
+        including waiting for input) is dropped instead of caught up on with many updates.
+        Default is 250."""
+        self._game.max_catch_up = max_catch_up
+        return self
+
+    def set_fixed_dt(self, fixed_dt: int):
+        """optional: Sets the game to always update with this dt, independent of the display refresh rate.
+        Frames run as many updates as the time passed covers (possibly none), and leftover time is passed to draw
+        as how far the game is through the next update, for modes with _INTERPOLATE_SPRITES set.
+        Default is not set, updating once per frame for the time passed (split up by max_dt)."""
+        if fixed_dt < 1:
+            raise ValueError("error: fixed_dt must not be less than 1")
+        self._game.fixed_dt = fixed_dt
+        return self
+
+    def set_frame_policy(self, frame_policy: FramePolicy):
+        """optional: Sets how the game waits out the rest of each frame.
+        BUSY spins (most accurate, keeps a core busy), SLEEP sleeps (least CPU, least accurate),
+        and HYBRID sleeps then spins for the end of the wait.
+        Default is HYBRID."""
+        self._game.frame_policy = frame_policy
+        return self
+
+    def set_frame_jitter_target(self, frame_jitter_target: float):
+        """optional: Sets how late in milliseconds HYBRID aims to keep frames within, spinning longer to meet it.
+        Default is 0.5."""
+        self._game.frame_jitter_target = frame_jitter_target
+        return self
+
     def set_auto_save(self):
         """optional: Sets the game to automatically save and load. (opposite of default behavior)"""
         self._game.auto_save = True
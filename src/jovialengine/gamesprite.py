@@ -11,6 +11,30 @@ from .modebase import ModeBase
 from .inputframe import InputFrame, StateChange
 
 
+_COLLIDE_HOOK_PREFIXES = (
+    'collide_enter_',
+    'collide_stay_',
+    'collide_exit_',
+)
+_collision_label_bits: dict[str, int] = dict()
+
+
+def get_collision_label_bit(label: str):
+    """Gets the bit used for a collision label, assigning the next free bit the first time a label is seen."""
+    bit = _collision_label_bits.get(label, None)
+    if bit is None:
+        bit = 1 << len(_collision_label_bits)
+        _collision_label_bits[label] = bit
+    return bit
+
+
+def _get_collision_labels_bits(labels: frozenset[str]):
+    bits = 0
+    for label in labels:
+        bits |= get_collision_label_bit(label)
+    return bits
+
+
 class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
     """Base class for many game objects.
     Subclasses should set:
@@ -21,6 +45,11 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
     optional: _COLLISION_MASK_LOCATION, location of image file for generating a collision mask
     optional: _COLLISION_MASK_ALPHA_OR_COLORKEY, used for loading image, required if _COLLISION_MASK_LOCATION is set
     optional: _GETS_INPUT, set this true to force this sprite to receive input
+    optional: _COLLISION_EVERY_STEP, set this true for sprites fast enough to pass through things within a frame,
+        so they are checked for collisions on every update step even in modes with _COLLISION_FINAL_STEP_ONLY set
+    optional: _STARTS_ASLEEP, set this true for sprites that usually don't move, see sleep()
+    optional: _COLLISION_MASK_PYRAMID, set this true for large masks (bosses, terrain pieces),
+        so mask collisions are first checked against coarse versions of the mask to quickly reject pairs not touching
 
     To hook in to collision checking against static background elements, create a function like so:
     def static_collide_backgroundLabel(self):
@@ -32,6 +61,15 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
         do_something()
     collide_OtherGameSpriteClassName will be called whenever there is a collision with a OtherGameSpriteClassName
     other will be the GameSprite collided with
+
+    To hook in to the start, continuation, or end of collisions with other sprites, create functions like so:
+    def collide_enter_OtherGameSpriteClassName(self, other: OtherGameSpriteClassName):
+    def collide_stay_OtherGameSpriteClassName(self, other: OtherGameSpriteClassName):
+    def collide_exit_OtherGameSpriteClassName(self, other: OtherGameSpriteClassName):
+    collide_enter_ is called on the first update step of a collision, collide_stay_ on following steps,
+    and collide_exit_ on the first step the sprites no longer collide (or one of them was removed from the mode)
+
+    Collision labels are compiled to bits when a class is created, stored in collision_bits and collides_with_bits.
     """
     _IMAGE_LOCATION: str = None
     _ALPHA_OR_COLORKEY: bool | tuple[int, int, int] | None = None
@@ -40,6 +78,11 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
     _COLLISION_MASK_LOCATION: str | None = None
     _COLLISION_MASK_ALPHA_OR_COLORKEY: bool | tuple[int, int, int] | None = None
     _GETS_INPUT: bool = False
+    _COLLISION_EVERY_STEP: bool = False
+    _STARTS_ASLEEP: bool = False
+    _COLLISION_MASK_PYRAMID: bool = False
+    collision_bits: int = 0
+    collides_with_bits: int = 0
 
     __slots__ = (
         '_input_frame',
@@ -53,8 +96,13 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
         '_mask_image_count_x',
         '_mask_image_count_y',
         '_mask_seq',
+        '_asleep',
     )
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._compile_collision_bits()
+
     def __init__(self, **kwargs):
         if self._IMAGE_LOCATION and self._ALPHA_OR_COLORKEY is None:
             raise RuntimeError(
@@ -68,6 +116,7 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
         self.image = None
         self.rect = None
         self._input_frame: InputFrame | None = None
+        self._asleep = self._STARTS_ASLEEP
         self._base_image: pygame.Surface | None = None
         self._image_count_x: int | None = None
         self._image_count_y: int | None = None
@@ -157,6 +206,23 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
         self._mask_source_rect.y = (self._mask_seq // self._mask_image_count_x) * size[1]
         self.mask = load.mask_surface(self._mask_image, tuple(self._mask_source_rect))
 
+    @final
+    @property
+    def is_asleep(self):
+        return self._asleep
+
+    @final
+    def sleep(self):
+        """Put this sprite to sleep.
+        Sleeping sprites are not checked for collisions with each other, only with sprites that are awake.
+        A sleeping sprite wakes up automatically when its rect changes."""
+        self._asleep = True
+
+    @final
+    def wake(self):
+        """Wake this sprite up, see sleep()."""
+        self._asleep = False
+
     @classmethod
     @final
     @cache
@@ -174,9 +240,61 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
         return frozenset([
             e.removeprefix('collide_')
             for e in dir(cls)
-            if e.startswith('collide_')
+            if e.startswith('collide_') and not e.startswith(_COLLIDE_HOOK_PREFIXES)
         ])
 
+    @classmethod
+    @final
+    @cache
+    def get_collide_enter_functions(cls):
+        """Get the unbound collide_enter_ functions of this class, by collision label."""
+        return cls._get_prefixed_functions('collide_enter_')
+
+    @classmethod
+    @final
+    @cache
+    def get_collide_stay_functions(cls):
+        """Get the unbound collide_stay_ functions of this class, by collision label."""
+        return cls._get_prefixed_functions('collide_stay_')
+
+    @classmethod
+    @final
+    @cache
+    def get_collide_exit_functions(cls):
+        """Get the unbound collide_exit_ functions of this class, by collision label."""
+        return cls._get_prefixed_functions('collide_exit_')
+
+    @classmethod
+    @final
+    def _get_prefixed_functions(cls, prefix: str):
+        return {
+            e.removeprefix(prefix): getattr(cls, e)
+            for e in dir(cls)
+            if e.startswith(prefix)
+        }
+
+    @classmethod
+    @final
+    @cache
+    def get_static_collide_functions(cls):
+        """Get the unbound static_collide_ functions of this class, by background label."""
+        return {
+            label: getattr(cls, 'static_collide_' + label)
+            for label
+            in cls.get_static_collides_with()
+        }
+
+    @classmethod
+    @final
+    @cache
+    def get_collide_functions(cls):
+        """Get the unbound collide_ functions of this class, by collision label."""
+        return {
+            label: getattr(cls, 'collide_' + label)
+            for label
+            in cls.get_collides_with()
+        }
+
     @classmethod
     @final
     @cache
@@ -189,6 +307,35 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
         labels.append('GameSprite')
         return frozenset(labels)
 
+    @classmethod
+    @final
+    def _compile_collision_bits(cls):
+        cls.collision_bits = _get_collision_labels_bits(cls.get_collision_labels())
+        cls.collides_with_bits = _get_collision_labels_bits(
+            cls.get_collides_with()
+            | cls.get_collide_enter_functions().keys()
+            | cls.get_collide_stay_functions().keys()
+            | cls.get_collide_exit_functions().keys()
+        )
+
+    @classmethod
+    @final
+    def has_collision_mask(cls):
+        return bool(cls._COLLISION_MASK_LOCATION)
+
+    @final
+    def get_collision_state(self):
+        """Get everything a mask collision check with this sprite depends on.
+        If this is unchanged for two sprites, a mask collision check between them will have the same result."""
+        return (
+            round(self.rect.x),
+            round(self.rect.y),
+            self.rect.size,
+            self.mask,
+            self._seq,
+            self._mask_seq,
+        )
+
     @final
     def does_collide_mask(self, mask: pygame.Mask):
         # rounding so that mask collisions reflect apparent (drawn) position of sprites
@@ -208,6 +355,9 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
             # rounding so that mask collisions reflect apparent (drawn) position of sprites
             dx = round(other.rect.x) - round(self.rect.x)
             dy = round(other.rect.y) - round(self.rect.y)
+            if (self._COLLISION_MASK_PYRAMID or other._COLLISION_MASK_PYRAMID) \
+                    and not self._does_collide_coarse(other, dx, dy):
+                return None
             return self.mask.overlap(other.mask, (dx, dy))
         else:
             # rounding so that rect collisions reflect apparent (drawn) positions of sprites
@@ -215,6 +365,34 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
             other_rect = other.rect.move_to(topleft=(round(other.rect.x), round(other.rect.y)))
             return self_rect.colliderect(other_rect)
 
+    @final
+    def _get_mask_pyramid(self):
+        if self._COLLISION_MASK_PYRAMID:
+            return load.mask_pyramid(self.mask)
+        # sprites without a pyramid are treated as filling their whole mask at every level
+        return load.mask_pyramid(load.mask_filled(self.mask.get_size()))
+
+    @final
+    def _does_collide_coarse(self, other: Self, dx: int, dy: int):
+        """Check whether the masks might overlap at the given offset, using coarse masks from coarsest to finest.
+        A False result means the full masks don't overlap."""
+        for (factor, coarse), (_, other_coarse) in zip(self._get_mask_pyramid(), other._get_mask_pyramid()):
+            # when the offset isn't a multiple of the factor, each coarse bit of other covers parts of two bits here
+            coarse_dx, remainder_x = divmod(dx, factor)
+            coarse_dy, remainder_y = divmod(dy, factor)
+            if not any(
+                coarse.overlap(other_coarse, (coarse_dx + step_x, coarse_dy + step_y))
+                for step_x in ((0, 1) if remainder_x else (0,))
+                for step_y in ((0, 1) if remainder_y else (0,))
+            ):
+                return False
+        return True
+
+    @classmethod
+    @final
+    def collides_every_step(cls):
+        return cls._COLLISION_EVERY_STEP
+
     @final
     def gets_input(self):
         return self._GETS_INPUT or self._take_state_change is not GameSprite._take_state_change
@@ -256,3 +434,6 @@ class GameSprite(pygame.sprite.Sprite, Saveable, abc.ABC):
         During this method call self._input_frame still holds the old input_frame.
         Overriding this method ensures that the child class will receive input."""
         pass
+
+
+GameSprite._compile_collision_bits()
@@ -1,3 +1,4 @@
+import math
 from functools import cache
 
 import pygame
@@ -40,6 +41,40 @@ def mask_surface(surface: pygame.Surface, rect: tuple[int, int, int, int] | None
     return pygame.mask.from_surface(surface)
 
 
+# coarse levels of mask pyramids, as the size in pixels of the block each coarse bit covers, coarsest first
+_MASK_PYRAMID_FACTORS = (8, 2)
+
+
+@cache
+def mask_coarse(mask: pygame.Mask, factor: int):
+    """Constructs a coarse occupancy mask from a mask.
+    Each bit is set if any bit in the matching factor x factor block of the mask is set.
+    The results are cached so don't alter them."""
+    size = mask.get_size()
+    coarse_size = (math.ceil(size[0] / factor), math.ceil(size[1] / factor))
+    padded_size = (coarse_size[0] * factor, coarse_size[1] * factor)
+    # spread each bit left over its block row, then up over its block, so the top left bit of each block is set
+    rows = pygame.mask.Mask(padded_size)
+    for x in range(factor):
+        rows.draw(mask, (-x, 0))
+    blocks = pygame.mask.Mask(padded_size)
+    for y in range(factor):
+        blocks.draw(rows, (0, -y))
+    return blocks.scale(coarse_size)
+
+
+@cache
+def mask_pyramid(mask: pygame.Mask):
+    """Constructs coarse occupancy masks from a mask, for each of _MASK_PYRAMID_FACTORS.
+    Returns a tuple of (factor, coarse mask), coarsest first.
+    The results are cached so don't alter them."""
+    return tuple(
+        (factor, mask_coarse(mask, factor))
+        for factor
+        in _MASK_PYRAMID_FACTORS
+    )
+
+
 @cache
 def mask_filled(size: tuple[int, int]):
     """Constructs a filled mask.
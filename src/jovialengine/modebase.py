@@ -1,26 +1,77 @@
 import abc
+import enum
+import math
+import time
+import itertools
 from typing import final, TYPE_CHECKING
-from collections.abc import Iterable
+from collections.abc import Iterable, Callable
 
 import pygame
 
 from . import load
 from . import display
+from . import narrowphase
 from .offsetgroup import OffsetGroup
 from .inputframe import InputFrame
+from .broadphase import get_bounds, SpatialHash, SweepAndPrune, RectIndex
+from .tiledmask import TiledMask
+from .collisionstats import CollisionStats
+from .chunkedbackground import ChunkedBackground
+from .worldstream import WorldStream, load_image_chunk, load_mask_chunk
 if TYPE_CHECKING:
     from .gamesprite import GameSprite
 
 
+class UpdatePolicy(enum.Enum):
+    CONTINUOUS = enum.auto()
+    THROTTLED = enum.auto()
+    EVENT_DRIVEN = enum.auto()
+
+
 class ModeBase(abc.ABC):
     """Base class for all game modes.
     Subclasses should set:
     optional: _SPACE_SIZE, size of the space inside this mode, if not supplied will assume display.screen_size
     optional: _CAMERA_SIZE, size of the camera inside this mode, if not supplied will assume display.screen_size
     optional: _CAMERA_OFFSET, offset for drawing camera view onto screen
+    optional: _BACKGROUND_CHUNK_SIZE, set this to split _background into a ChunkedBackground with chunks of this size,
+        good for large spaces, only chunks drawn onto are allocated and only chunks in view are drawn
     optional: _STATIC_COLLISION_MASK_INFOS, iterable of setup information for collision masks for colliding with static
         background elements
         (LABEL, COLLISION_MASK, _COLLISION_MASK_ALPHA_OR_COLORKEY)
+    optional: _STATIC_COLLISION_TILE_SIZE, size of the tiles static collision masks are split into
+    optional: _STREAM_CHUNK_SIZE, set this to stream a world too large to keep loaded from disk in chunks of this size,
+        loading chunks on a background thread as the camera approaches them
+        and removing them as it leaves once over _STREAM_MEMORY_BUDGET
+        static collision masks with {x} and {y} in their location are streamed, with {x} and {y} replaced by the
+        column and row of each chunk, chunks without a file have nothing to collide with
+    optional: _STREAM_BACKGROUND, location of background image files for streaming, with {x} and {y} as above,
+        _background is a ChunkedBackground and chunks without a file are left as its fill color
+    optional: _STREAM_MARGIN, how far out from the camera to start loading chunks, if not supplied one chunk
+    optional: _STREAM_MEMORY_BUDGET, approximate number of bytes streamed chunks can use
+    optional: _COLLISION_CELL_SIZE, set this to only check sprite collisions between sprites sharing a cell of a grid
+        with cells of this size, otherwise every pair of sprites is checked
+    optional: _COLLISION_SWEEP_AXIS, set this to 0 (x) or 1 (y) to instead only check sprite collisions between sprites
+        found overlapping by sweeping along that axis, good for sprites spread out along one axis
+    optional: _COLLISION_VECTORIZE_CIRCLES, set this true to check collisions between all pairs of sprites with
+        collision radii at once using numpy, good for large numbers of circle sprites (ignored if numpy is missing)
+    optional: _COLLISION_FINAL_STEP_ONLY, set this true to only check collisions on the final update step of each frame,
+        except for sprites with _COLLISION_EVERY_STEP set, which are still checked on every update step
+    optional: _INDEX_CELL_SIZE, size of grid cells used to find sleeping sprites and for spatial queries,
+        if _COLLISION_CELL_SIZE isn't set
+    optional: _DIRTY_RECTS, set this true to only redraw and present the areas of the screen that changed,
+        good for mostly static scenes, see invalidate()
+    optional: _REDRAW_ON_CHANGE, set this true to only draw and present frames when something changed: input events came
+        in, the camera moved, or sprites moved, changed image, or were added or removed,
+        anything else that changes what is drawn (like timers) needs invalidate(), good for menus
+    optional: _UPDATE_POLICY, how often the game loop runs while in this mode,
+        CONTINUOUS runs at the display refresh rate, THROTTLED runs at _UPDATE_RATE,
+        and EVENT_DRIVEN waits for input before running, or until _get_wait_time() runs out, good for menus
+    optional: _UPDATE_RATE, loops per second for THROTTLED
+    optional: _INTERPOLATE_SPRITES, set this true to draw sprites between where they were before and after the last
+        update step, by the alpha passed to draw(), for smooth movement with a fixed timestep (see GameBuilder)
+    optional: _COLLISION_STATS, set this true to start with collision_stats counting collision checks,
+        collision_stats can also be set to a CollisionStats (or None) at any time
 
     When a subclass wants to pass on to another mode, set self.next_mode.
     Don't create another mode unless you are immediately assigning it to self.next_mode.
@@ -28,17 +79,53 @@ class ModeBase(abc.ABC):
     _SPACE_SIZE: tuple[int, int] | None = None
     _CAMERA_SIZE: tuple[int, int] | None = None
     _CAMERA_OFFSET: tuple[int, int] = (0, 0)
+    _BACKGROUND_CHUNK_SIZE: int | None = None
     _STATIC_COLLISION_MASK_INFOS: Iterable[tuple[str, str, bool | tuple[int, int, int]]] = ()
+    _STATIC_COLLISION_TILE_SIZE: int = 64
+    _STREAM_CHUNK_SIZE: int | None = None
+    _STREAM_BACKGROUND: str | None = None
+    _STREAM_MARGIN: int | None = None
+    _STREAM_MEMORY_BUDGET: int = 64 * 1024 * 1024
+    _COLLISION_CELL_SIZE: int | None = None
+    _COLLISION_SWEEP_AXIS: int | None = None
+    _COLLISION_VECTORIZE_CIRCLES: bool = False
+    _COLLISION_FINAL_STEP_ONLY: bool = False
+    _INDEX_CELL_SIZE: int = 64
+    _COLLISION_STATS: bool = False
+    _DIRTY_RECTS: bool = False
+    _REDRAW_ON_CHANGE: bool = False
+    _UPDATE_POLICY: UpdatePolicy = UpdatePolicy.CONTINUOUS
+    _UPDATE_RATE: int = 10
+    _INTERPOLATE_SPRITES: bool = False
 
     __slots__ = (
         'sprites_all',
         '_sprites_game',
         '_sprites_input',
         '_map_sprites_static_collide',
+        '_map_sprites_class',
+        '_collide_interests',
+        '_collide_class_pairs',
+        '_collide_classes',
+        '_collide_cache',
+        '_collide_touching',
         '_background',
         '_static_collision_masks',
+        '_stream',
+        '_broadphase',
+        '_sleeping_sprites',
+        '_sleeping_index',
+        '_query_index',
+        '_query_order',
         '_camera',
+        '_dirty_surface',
+        '_dirty_offset',
+        '_dirty_sprites',
+        '_dirty_rects',
+        '_is_draw_pending',
+        '_previous_positions',
         '_input_frame',
+        'collision_stats',
         'next_mode',
     )
 
@@ -47,19 +134,105 @@ class ModeBase(abc.ABC):
         self._sprites_game: pygame.sprite.Group[GameSprite] = pygame.sprite.Group()
         self._sprites_input: pygame.sprite.Group[GameSprite] = pygame.sprite.Group()
         self._map_sprites_static_collide: dict[str, pygame.sprite.Group[GameSprite]] = dict()
-        self._background = pygame.Surface(self.get_space_size()).convert()
-        self._background.fill((0, 0, 0))
-        self._static_collision_masks: list[tuple[str, pygame.mask.Mask]] = []
+        self._map_sprites_class: dict[type[GameSprite], pygame.sprite.Group[GameSprite]] = dict()
+        # maps pairs of sprite classes to the unbound functions each calls on the other, as
+        # ((collide, collide_enter, collide_stay, collide_exit), (same for other class), has collide hooks)
+        self._collide_interests: dict[
+            tuple[type[GameSprite], type[GameSprite]],
+            tuple[tuple[tuple[Callable, ...], ...], tuple[tuple[Callable, ...], ...], bool]
+        ] = dict()
+        self._collide_class_pairs: list[tuple[type[GameSprite], type[GameSprite]]] = []
+        self._collide_classes: set[type[GameSprite]] = set()
+        # results of mask collision checks, with the collision states of the sprites they were checked with
+        self._collide_cache: dict[tuple[GameSprite, GameSprite], tuple[tuple, tuple, bool]] = dict()
+        # pairs of colliding sprites with collide hooks, from previous update steps
+        self._collide_touching: dict[tuple[GameSprite, GameSprite], None] = dict()
+        self._stream: WorldStream | None = None
+        if self._STREAM_CHUNK_SIZE:
+            self._stream = WorldStream(
+                self.get_space_size(),
+                self._STREAM_CHUNK_SIZE,
+                self._STREAM_CHUNK_SIZE if self._STREAM_MARGIN is None else self._STREAM_MARGIN,
+                self._STREAM_MEMORY_BUDGET
+            )
+        elif self._STREAM_BACKGROUND:
+            raise RuntimeError("error: if _STREAM_BACKGROUND is set, _STREAM_CHUNK_SIZE must be set")
+        self._background: pygame.Surface | ChunkedBackground
+        if self._STREAM_BACKGROUND:
+            self._background = ChunkedBackground(self.get_space_size(), self._STREAM_CHUNK_SIZE)
+            self._stream.add_layer(
+                lambda chunk_pos: load_image_chunk(self._STREAM_BACKGROUND.format(x=chunk_pos[0], y=chunk_pos[1])),
+                self.__add_background_chunk,
+                self.__remove_background_chunk
+            )
+        elif self._BACKGROUND_CHUNK_SIZE:
+            self._background = ChunkedBackground(self.get_space_size(), self._BACKGROUND_CHUNK_SIZE)
+        else:
+            self._background = pygame.Surface(self.get_space_size()).convert()
+            self._background.fill((0, 0, 0))
+        self._static_collision_masks: list[tuple[str, TiledMask]] = []
         for i, static_collision_mask_info in enumerate(self._STATIC_COLLISION_MASK_INFOS):
             if not isinstance(static_collision_mask_info[0], str):
                 raise TypeError(f"error: _STATIC_COLLISION_MASK_INFOS[{i}][0] must be a string")
-            mask_image = load.image(static_collision_mask_info[1], static_collision_mask_info[2])
-            mask = load.mask_surface(mask_image)
+            if self._stream and '{x}' in static_collision_mask_info[1]:
+                mask = TiledMask.empty(self.get_space_size(), self._STREAM_CHUNK_SIZE)
+                self.__add_stream_mask_layer(mask, static_collision_mask_info[1], static_collision_mask_info[2])
+            else:
+                mask_image = load.image(static_collision_mask_info[1], static_collision_mask_info[2])
+                mask = TiledMask(load.mask_surface(mask_image), self._STATIC_COLLISION_TILE_SIZE)
             self._static_collision_masks.append((static_collision_mask_info[0], mask))
+        if self._COLLISION_CELL_SIZE and self._COLLISION_SWEEP_AXIS is not None:
+            raise RuntimeError("error: only one of _COLLISION_CELL_SIZE and _COLLISION_SWEEP_AXIS can be set")
+        self._broadphase: SpatialHash | SweepAndPrune | None = None
+        if self._COLLISION_CELL_SIZE:
+            self._broadphase = SpatialHash(self._COLLISION_CELL_SIZE)
+        elif self._COLLISION_SWEEP_AXIS is not None:
+            self._broadphase = SweepAndPrune(self._COLLISION_SWEEP_AXIS)
+        # sleeping sprites with the rects they had when they were added to the index
+        self._sleeping_sprites: dict[GameSprite, tuple[float, float, float, float]] = dict()
+        self._sleeping_index = RectIndex(self._COLLISION_CELL_SIZE or self._INDEX_CELL_SIZE)
+        self._query_index = RectIndex(self._COLLISION_CELL_SIZE or self._INDEX_CELL_SIZE)
+        # sprites in the query index with their order and drawn rect when it was built, None until it needs rebuilding
+        self._query_order: dict[GameSprite, tuple[int, pygame.FRect]] | None = None
         self._camera = pygame.FRect((0, 0), self._CAMERA_SIZE or display.screen_size)
+        # for _DIRTY_RECTS and _REDRAW_ON_CHANGE, the surface and offset last drawn with, the image and screen rect
+        # each sprite was drawn with, and areas of the screen invalidated since
+        self._dirty_surface: pygame.Surface | None = None
+        self._dirty_offset: tuple[int, int] | None = None
+        self._dirty_sprites: dict[pygame.sprite.Sprite, tuple[pygame.Surface, tuple[int, int, int, int]]] = dict()
+        self._dirty_rects: list[pygame.Rect] = []
+        # whether the mode was invalidated (or never drawn) since it was last drawn
+        self._is_draw_pending = True
+        # for _INTERPOLATE_SPRITES, where sprites were before the last update step
+        self._previous_positions: dict[pygame.sprite.Sprite, tuple[float, float]] = dict()
         self._input_frame: InputFrame | None = None
+        # nothing is counted or timed while this is None
+        self.collision_stats: CollisionStats | None = CollisionStats() if self._COLLISION_STATS else None
         self.next_mode: ModeBase | None = None
 
+    @final
+    def __add_background_chunk(self, chunk_pos: tuple[int, int], chunk: pygame.Surface):
+        self._background.set_chunk(chunk_pos, chunk.convert())
+        self.invalidate()
+
+    @final
+    def __remove_background_chunk(self, chunk_pos: tuple[int, int]):
+        self._background.remove_chunk(chunk_pos)
+        self.invalidate()
+
+    @final
+    def __add_stream_mask_layer(
+            self,
+            mask: TiledMask,
+            location: str,
+            alpha_or_colorkey: bool | tuple[int, int, int]
+    ):
+        self._stream.add_layer(
+            lambda chunk_pos: load_mask_chunk(location.format(x=chunk_pos[0], y=chunk_pos[1]), alpha_or_colorkey),
+            mask.set_tile,
+            lambda chunk_pos: mask.set_tile(chunk_pos, None)
+        )
+
     @final
     def add_sprite(self, sprite: GameSprite):
         """Adds the sprite to appropriate groups in this mode."""
@@ -71,78 +244,671 @@ class ModeBase(abc.ABC):
             if sprite_collides_with not in self._map_sprites_static_collide:
                 self._map_sprites_static_collide[sprite_collides_with] = pygame.sprite.Group()
             self._map_sprites_static_collide[sprite_collides_with].add(sprite)
+        self._query_order = None
+        sprite_cls = type(sprite)
+        if sprite_cls not in self._map_sprites_class:
+            self.__add_sprite_cls(sprite_cls)
+        self._map_sprites_class[sprite_cls].add(sprite)
+
+    @final
+    def __add_sprite_cls(self, sprite_cls: type[GameSprite]):
+        self._map_sprites_class[sprite_cls] = pygame.sprite.Group()
+        for other_cls in self._map_sprites_class:
+            if not (sprite_cls.collides_with_bits & other_cls.collision_bits
+                    or other_cls.collides_with_bits & sprite_cls.collision_bits):
+                continue
+            sprite_cls_collides = self.__get_collide_functions(sprite_cls, other_cls)
+            other_cls_collides = self.__get_collide_functions(other_cls, sprite_cls)
+            has_hooks = any(sprite_cls_collides[1:]) or any(other_cls_collides[1:])
+            self._collide_interests[(sprite_cls, other_cls)] = (sprite_cls_collides, other_cls_collides, has_hooks)
+            self._collide_interests[(other_cls, sprite_cls)] = (other_cls_collides, sprite_cls_collides, has_hooks)
+            self._collide_class_pairs.append((sprite_cls, other_cls))
+            self._collide_classes.add(sprite_cls)
+            self._collide_classes.add(other_cls)
+
+    @staticmethod
+    def __get_collide_functions(sprite_cls: type[GameSprite], other_cls: type[GameSprite]):
+        other_labels = other_cls.get_collision_labels()
+        return (
+            tuple(
+                sprite_cls.get_collide_functions()[label]
+                for label
+                in sprite_cls.get_collides_with() & other_labels
+            ),
+        ) + tuple(
+            tuple(
+                function
+                for label, function
+                in hook_functions.items()
+                if label in other_labels
+            )
+            for hook_functions
+            in (
+                sprite_cls.get_collide_enter_functions(),
+                sprite_cls.get_collide_stay_functions(),
+                sprite_cls.get_collide_exit_functions(),
+            )
+        )
 
     @final
     def input(self, events: Iterable[pygame.event.Event], input_frame: InputFrame):
         """All game modes can take in input."""
         for event in events:
             self._take_event(event)
+            if self._REDRAW_ON_CHANGE:
+                self.invalidate()
         self._take_frame(input_frame)
         for sprite in self._sprites_input.sprites():
             sprite.input(input_frame)
         self._input_frame = input_frame
 
     @final
-    def update(self, dt: int):
-        """All game modes can update."""
+    def update(self, dt: int, is_final_step: bool = True):
+        """All game modes can update.
+        A long frame is split into several update steps, is_final_step is False for all but the last of them."""
+        if self._INTERPOLATE_SPRITES:
+            self._previous_positions = {
+                sprite: sprite.rect.topleft
+                for sprite
+                in self.sprites_all.sprites()
+            }
         self._update_pre_sprites(dt)
         for sprite in self.sprites_all.sprites():
             sprite.update(dt, self._camera)
         self._update_post_sprites(dt)
-        self.__handle_static_collisions()
-        self.__handle_collisions()
+        self._query_order = None
+        if self._stream:
+            self._stream.update(self._camera)
+        every_step_only = self._COLLISION_FINAL_STEP_ONLY and not is_final_step
+        stats = self.collision_stats
+        if stats is not None:
+            stats.steps += 1
+        self.__handle_static_collisions(every_step_only, stats)
+        self.__handle_collisions(every_step_only, stats)
 
     @final
-    def __handle_static_collisions(self):
+    def __handle_static_collisions(self, every_step_only: bool, stats: CollisionStats | None):
+        if stats is not None:
+            start_time = time.perf_counter_ns()
         for static_collision_mask in self._static_collision_masks:
             sprites_static_collide = self._map_sprites_static_collide.get(static_collision_mask[0], None)
             if sprites_static_collide is not None:
                 static_collide_sprites = sprites_static_collide.sprites()
+                if every_step_only:
+                    static_collide_sprites = [
+                        sprite
+                        for sprite
+                        in static_collide_sprites
+                        if sprite.collides_every_step()
+                    ]
+                if stats is not None:
+                    stats.static_checks += len(static_collide_sprites)
                 for sprite in static_collide_sprites:
-                    if sprite.does_collide_mask(static_collision_mask[1]):
-                        getattr(sprite, 'static_collide_' + static_collision_mask[0])()
+                    # rounding so that mask collisions reflect apparent (drawn) position of sprites
+                    sprite_pos = (round(sprite.rect.x), round(sprite.rect.y))
+                    if static_collision_mask[1].overlap(sprite.mask, sprite_pos):
+                        if stats is not None:
+                            stats.static_hits += 1
+                        sprite.get_static_collide_functions()[static_collision_mask[0]](sprite)
+        if stats is not None:
+            stats.static_time += time.perf_counter_ns() - start_time
 
     @final
-    def __handle_collisions(self):
-        collide_events = []
+    def __update_sleeping(self, collide_sprites: list[GameSprite]):
+        for sprite, sleeping_rect in tuple(self._sleeping_sprites.items()):
+            if sprite not in self._sprites_game:
+                del self._sleeping_sprites[sprite]
+                self._sleeping_index.remove(sprite)
+            elif not sprite.is_asleep or tuple(sprite.rect) != sleeping_rect:
+                # sprites wake up when they move
+                sprite.wake()
+                del self._sleeping_sprites[sprite]
+                self._sleeping_index.remove(sprite)
+        for sprite in collide_sprites:
+            if sprite.is_asleep and sprite not in self._sleeping_sprites and type(sprite) in self._collide_classes:
+                self._sleeping_sprites[sprite] = tuple(sprite.rect)
+                self._sleeping_index.add(sprite)
+
+    @final
+    def __get_collide_pairs(
+            self,
+            collide_sprites: list[GameSprite],
+            skip_circles: bool,
+            every_step_only: bool,
+            stats: CollisionStats | None
+    ):
+        """Get pairs of sprites to check for collisions, and pairs of rect sprites already found to collide."""
+        awake_sprites = [
+            sprite
+            for sprite
+            in collide_sprites
+            if type(sprite) in self._collide_classes and sprite not in self._sleeping_sprites
+        ]
+        if self._broadphase and not self._sleeping_sprites:
+            return self._broadphase.get_pairs(awake_sprites), []
+        indexes = {
+            sprite: i
+            for i, sprite
+            in enumerate(collide_sprites)
+        }
+        index_pairs: list[tuple[int, int]] = []
+        rect_hits: list[tuple[GameSprite, GameSprite]] = []
+        if self._broadphase:
+            for sprite0, sprite1 in self._broadphase.get_pairs(awake_sprites):
+                index_pairs.append((indexes[sprite0], indexes[sprite1]))
+        else:
+            # only pairs of classes that are interested in each other are checked
+            class_groups: dict[type[GameSprite], tuple[list, list, list, list]] = dict()
+            for sprite_cls0, sprite_cls1 in self._collide_class_pairs:
+                if every_step_only and not (sprite_cls0.collides_every_step() or sprite_cls1.collides_every_step()):
+                    continue
+                same_cls = sprite_cls0 is sprite_cls1
+                groups0 = self.__get_class_groups(sprite_cls0, class_groups)
+                groups1 = self.__get_class_groups(sprite_cls1, class_groups)
+                # pairs of rect sprites are checked a whole class at a time
+                rects1 = groups1[3]
+                for k, sprite0 in enumerate(groups0[0]):
+                    for m in groups0[3][k].collidelistall(rects1):
+                        if not same_cls or m > k:
+                            sprite1 = groups1[0][m]
+                            if indexes[sprite0] < indexes[sprite1]:
+                                rect_hits.append((sprite0, sprite1))
+                            else:
+                                rect_hits.append((sprite1, sprite0))
+                if stats is not None:
+                    rect_count0 = len(groups0[0])
+                    rect_checks = rect_count0 * (rect_count0 - 1) // 2 if same_cls else rect_count0 * len(rects1)
+                    stats.pairs_considered += rect_checks
+                    stats.rect_checks += rect_checks
+                for sprite0, sprite1 in self.__get_class_pairs(groups0, groups1, same_cls, skip_circles):
+                    i = indexes[sprite0]
+                    j = indexes[sprite1]
+                    index_pairs.append((i, j) if i < j else (j, i))
+        # pairs of sleeping sprites are never checked, awake sprites are checked against nearby sleeping sprites
+        if self._sleeping_sprites:
+            for sprite0 in awake_sprites:
+                i = indexes[sprite0]
+                for sprite1 in self._sleeping_index.query(get_bounds(sprite0)):
+                    j = indexes[sprite1]
+                    index_pairs.append((i, j) if i < j else (j, i))
+        index_pairs.sort()
+        return [
+            (collide_sprites[i], collide_sprites[j])
+            for i, j
+            in index_pairs
+        ], rect_hits
+
+    @final
+    def __get_class_groups(self, sprite_cls: type[GameSprite], class_groups: dict):
+        """Get the awake sprites of a class split into rect sprites, mask sprites, circle sprites,
+        plus the drawn rects of the rect sprites."""
+        groups = class_groups.get(sprite_cls, None)
+        if groups is None:
+            rect_sprites = []
+            mask_sprites = []
+            circle_sprites = []
+            for sprite in self._map_sprites_class[sprite_cls].sprites():
+                if sprite in self._sleeping_sprites:
+                    continue
+                if sprite.radius:
+                    circle_sprites.append(sprite)
+                elif sprite.has_collision_mask():
+                    mask_sprites.append(sprite)
+                else:
+                    rect_sprites.append(sprite)
+            groups = (
+                rect_sprites,
+                mask_sprites,
+                circle_sprites,
+                [self.__get_drawn_rect(sprite) for sprite in rect_sprites],
+            )
+            class_groups[sprite_cls] = groups
+        return groups
+
+    @staticmethod
+    def __get_class_pairs(groups0: tuple, groups1: tuple, same_cls: bool, skip_circles: bool):
+        """Get pairs of sprites between two classes, leaving out pairs where both are rect sprites,
+        and where both are circle sprites if skip_circles is set."""
+        class_pairs = []
+        for a in range(3):
+            for b in range(3):
+                if (same_cls and b < a) or (a == 0 and b == 0) or (skip_circles and a == 2 and b == 2):
+                    continue
+                if same_cls and a == b:
+                    class_pairs.append(itertools.combinations(groups0[a], 2))
+                else:
+                    class_pairs.append(itertools.product(groups0[a], groups1[b]))
+        return itertools.chain.from_iterable(class_pairs)
+
+    @final
+    def __does_collide(self, sprite0: GameSprite, sprite1: GameSprite, collide_cache: dict):
+        if (sprite0.radius and sprite1.radius) or not (
+                sprite0.radius or sprite1.radius or sprite0.has_collision_mask() or sprite1.has_collision_mask()):
+            # circle and rect checks are about as cheap as checking the cache
+            return sprite0.does_collide(sprite1)
+        # mask checks are reused if neither sprite has changed since the last check
+        key = (sprite0, sprite1)
+        state0 = sprite0.get_collision_state()
+        state1 = sprite1.get_collision_state()
+        cached = self._collide_cache.get(key, None)
+        if cached is not None and cached[0] == state0 and cached[1] == state1:
+            result = cached[2]
+        else:
+            result = bool(sprite0.does_collide(sprite1))
+        collide_cache[key] = (state0, state1, result)
+        return result
+
+    @final
+    def __handle_collisions(self, every_step_only: bool, stats: CollisionStats | None):
+        if stats is not None:
+            start_time = time.perf_counter_ns()
         collide_sprites = self._sprites_game.sprites()
-        for i, sprite0 in enumerate(collide_sprites):
-            for j in range(i + 1, len(collide_sprites)):
-                sprite1 = collide_sprites[j]
-                sprite0_collides = sprite0.get_collides_with() & sprite1.get_collision_labels()
-                sprite1_collides = sprite1.get_collides_with() & sprite0.get_collision_labels()
-                if (sprite0_collides or sprite1_collides) and sprite0.does_collide(sprite1):
-                    for sprite0_collide in sprite0_collides:
-                        collide_events.append((getattr(sprite0, 'collide_' + sprite0_collide), sprite1,))
-                    for sprite1_collide in sprite1_collides:
-                        collide_events.append((getattr(sprite1, 'collide_' + sprite1_collide), sprite0,))
+        self.__update_sleeping(collide_sprites)
+        vectorize_circles = self._COLLISION_VECTORIZE_CIRCLES and narrowphase.can_vectorize()
+        collide_cache: dict[tuple[GameSprite, GameSprite], tuple[tuple, tuple, bool]] = dict()
+        collide_pairs, collide_hits = self.__get_collide_pairs(
+            collide_sprites, vectorize_circles, every_step_only, stats
+        )
+        if stats is not None:
+            end_time = time.perf_counter_ns()
+            stats.broadphase_time += end_time - start_time
+            start_time = end_time
+        needs_sort = bool(collide_hits)
+        labelled_pairs = [
+            pair
+            for pair
+            in collide_pairs
+            if pair[0].collides_with_bits & pair[1].collision_bits
+            or pair[1].collides_with_bits & pair[0].collision_bits
+        ]
+        check_pairs = labelled_pairs
+        if every_step_only or vectorize_circles:
+            check_pairs = [
+                pair
+                for pair
+                in labelled_pairs
+                if (not every_step_only or pair[0].collides_every_step() or pair[1].collides_every_step())
+                and not (vectorize_circles and pair[0].radius and pair[1].radius)
+            ]
+        for sprite0, sprite1 in check_pairs:
+            if self.__does_collide(sprite0, sprite1, collide_cache):
+                collide_hits.append((sprite0, sprite1))
+        self._collide_cache = collide_cache
+        if vectorize_circles:
+            circle_sprites = [
+                sprite
+                for sprite
+                in collide_sprites
+                if sprite.radius and type(sprite) in self._collide_classes
+            ]
+            collide_hits.extend(
+                (sprite0, sprite1)
+                for sprite0, sprite1
+                in narrowphase.get_circle_collisions(circle_sprites)
+                if not (sprite0 in self._sleeping_sprites and sprite1 in self._sleeping_sprites)
+                and (not every_step_only or sprite0.collides_every_step() or sprite1.collides_every_step())
+            )
+            needs_sort = True
+        if needs_sort:
+            indexes = {
+                sprite: i
+                for i, sprite
+                in enumerate(collide_sprites)
+            }
+            collide_hits.sort(key=lambda pair: (indexes[pair[0]], indexes[pair[1]]))
+        if stats is not None:
+            self.__count_collisions(stats, collide_pairs, labelled_pairs, check_pairs, collide_hits)
+            if vectorize_circles:
+                stats.circle_checks += len(circle_sprites) * (len(circle_sprites) - 1) // 2
+            end_time = time.perf_counter_ns()
+            stats.narrowphase_time += end_time - start_time
+            start_time = end_time
+        collide_events = []
+        collide_touching: dict[tuple[GameSprite, GameSprite], None] = dict()
+        for sprite0, sprite1 in collide_hits:
+            collide_interest = self._collide_interests[(type(sprite0), type(sprite1))]
+            for sprite0_collide in collide_interest[0][0]:
+                collide_events.append((sprite0_collide, sprite0, sprite1,))
+            for sprite1_collide in collide_interest[1][0]:
+                collide_events.append((sprite1_collide, sprite1, sprite0,))
+            if collide_interest[2]:
+                # collide_enter_ for new collisions, collide_stay_ for continuing ones
+                was_touching = (sprite0, sprite1) in self._collide_touching \
+                    or (sprite1, sprite0) in self._collide_touching
+                hook = 2 if was_touching else 1
+                for sprite0_collide in collide_interest[0][hook]:
+                    collide_events.append((sprite0_collide, sprite0, sprite1,))
+                for sprite1_collide in collide_interest[1][hook]:
+                    collide_events.append((sprite1_collide, sprite1, sprite0,))
+                collide_touching[(sprite0, sprite1)] = None
+        for sprite0, sprite1 in self._collide_touching:
+            if (sprite0, sprite1) in collide_touching or (sprite1, sprite0) in collide_touching:
+                continue
+            if sprite0 in self._sprites_game and sprite1 in self._sprites_game and (
+                    (sprite0 in self._sleeping_sprites and sprite1 in self._sleeping_sprites)
+                    or (every_step_only and not (sprite0.collides_every_step() or sprite1.collides_every_step()))):
+                # this pair wasn't checked this update step
+                collide_touching[(sprite0, sprite1)] = None
+                continue
+            collide_interest = self._collide_interests[(type(sprite0), type(sprite1))]
+            for sprite0_collide in collide_interest[0][3]:
+                collide_events.append((sprite0_collide, sprite0, sprite1,))
+            for sprite1_collide in collide_interest[1][3]:
+                collide_events.append((sprite1_collide, sprite1, sprite0,))
+        self._collide_touching = collide_touching
         for collide_event in collide_events:
-            collide_event[0](collide_event[1])
+            collide_event[0](collide_event[1], collide_event[2])
+        if stats is not None:
+            stats.events_time += time.perf_counter_ns() - start_time
+
+    @staticmethod
+    def __count_collisions(
+            stats: CollisionStats,
+            collide_pairs: list[tuple[GameSprite, GameSprite]],
+            labelled_pairs: list[tuple[GameSprite, GameSprite]],
+            check_pairs: list[tuple[GameSprite, GameSprite]],
+            collide_hits: list[tuple[GameSprite, GameSprite]]
+    ):
+        stats.pairs_considered += len(collide_pairs)
+        stats.pairs_filtered += len(collide_pairs) - len(labelled_pairs)
+        stats.hits += len(collide_hits)
+        for sprite0, sprite1 in check_pairs:
+            # same split as GameSprite.does_collide
+            if sprite0.radius and sprite1.radius:
+                stats.circle_checks += 1
+            elif sprite0.radius or sprite1.radius or sprite0.has_collision_mask() or sprite1.has_collision_mask():
+                stats.mask_checks += 1
+            else:
+                stats.rect_checks += 1
 
     @final
-    def draw(self, screen: pygame.Surface):
-        """All game modes can draw to the screen"""
+    def __get_query_index(self):
+        if self._query_order is None:
+            sprites = self._sprites_game.sprites()
+            self._query_order = {
+                sprite: (i, self.__get_drawn_rect(sprite))
+                for i, sprite
+                in enumerate(sprites)
+            }
+            for sprite in self._query_index.sprites():
+                if sprite not in self._query_order:
+                    self._query_index.remove(sprite)
+            for sprite in sprites:
+                self._query_index.add(sprite)
+        return self._query_index
+
+    @staticmethod
+    def __get_drawn_rect(sprite: GameSprite):
+        # rounding so that queries reflect apparent (drawn) positions of sprites
+        return sprite.rect.move_to(topleft=(round(sprite.rect.x), round(sprite.rect.y)))
+
+    @final
+    def __get_query_results(self, candidates: Iterable[GameSprite], label: str | None, test: Callable):
+        """Get the candidates still in this mode with the label that pass the test with their indexed rect, in order."""
+        results = []
+        for sprite in candidates:
+            # sprites can be removed during an update step, after the index was built
+            if sprite not in self._sprites_game:
+                continue
+            if label is not None and label not in sprite.get_collision_labels():
+                continue
+            order, rect = self._query_order[sprite]
+            if test(rect):
+                results.append((order, sprite))
+        results.sort(key=lambda result: result[0])
+        return [sprite for _, sprite in results]
+
+    @final
+    def __query(self, bounds: tuple[float, float, float, float], label: str | None, test: Callable):
+        return self.__get_query_results(self.__get_query_index().query(bounds), label, test)
+
+    @final
+    def query_rect(self, rect: pygame.typing.RectLike, label: str | None = None):
+        """Get the sprites in this mode whose rects collide with rect.
+        If label is set, only get sprites with that collision label.
+        Positions are as of the last update step, or when a sprite was last added."""
+        rect = pygame.FRect(rect)
+        return self.__query(
+            (rect.left, rect.top, rect.right, rect.bottom),
+            label,
+            lambda sprite_rect: sprite_rect.colliderect(rect)
+        )
+
+    @final
+    def query_point(self, point: pygame.typing.Point, label: str | None = None):
+        """Get the sprites in this mode whose rects contain point.
+        If label is set, only get sprites with that collision label.
+        Positions are as of the last update step, or when a sprite was last added."""
+        return self.__query(
+            (point[0], point[1], point[0], point[1]),
+            label,
+            lambda sprite_rect: sprite_rect.collidepoint(point)
+        )
+
+    @final
+    def query_radius(self, center: pygame.typing.Point, radius: float, label: str | None = None):
+        """Get the sprites in this mode whose rects are within radius of center.
+        If label is set, only get sprites with that collision label.
+        Positions are as of the last update step, or when a sprite was last added."""
+        def test(sprite_rect: pygame.FRect):
+            dx = pygame.math.clamp(center[0], sprite_rect.left, sprite_rect.right) - center[0]
+            dy = pygame.math.clamp(center[1], sprite_rect.top, sprite_rect.bottom) - center[1]
+            return dx**2 + dy**2 <= radius**2
+        return self.__query(
+            (center[0] - radius, center[1] - radius, center[0] + radius, center[1] + radius),
+            label,
+            test
+        )
+
+    @final
+    def raycast(self, start: pygame.typing.Point, end: pygame.typing.Point, label: str | None = None):
+        """Find the first thing hit going from start to end, either a sprite rect or a static collision mask.
+        Returns the sprite or the label of the static collision mask, and the point hit, or None if nothing is hit.
+        If label is set, only sprites with that collision label or the static collision mask with that label are hit.
+        Positions are as of the last update step, or when a sprite was last added."""
+        start = pygame.Vector2(start)
+        end = pygame.Vector2(end)
+        result: tuple[GameSprite | str, tuple[float, float]] | None = None
+        result_distance = math.inf
+        sprites = self.__get_query_results(
+            self.__get_query_index().query_line(start, end),
+            label,
+            lambda sprite_rect: sprite_rect.clipline(start, end)
+        )
+        for sprite in sprites:
+            clipped = self._query_order[sprite][1].clipline(start, end)
+            if clipped:
+                distance = start.distance_to(clipped[0])
+                if distance < result_distance:
+                    result = (sprite, tuple(clipped[0]))
+                    result_distance = distance
+        for static_collision_mask in self._static_collision_masks:
+            if label is not None and label != static_collision_mask[0]:
+                continue
+            point = static_collision_mask[1].raycast(start, end, result_distance)
+            if point:
+                distance = start.distance_to(point)
+                if distance < result_distance:
+                    result = (static_collision_mask[0], point)
+                    result_distance = distance
+        return result
+
+    @final
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0):
+        """All game modes can draw to the screen.
+        With a fixed timestep, alpha is how far the game is through the time until the next update step, from 0 to 1.
+        With _INTERPOLATE_SPRITES set, sprites are drawn that far between where they were before the last update step
+        and where they are now, they are moved there for _update_pre_draw() and drawing, then moved back.
+        Returns the areas of the screen that were redrawn, or None if the whole screen was.
+        An empty list means nothing was redrawn, so there is nothing new to present."""
+        self._is_draw_pending = False
+        if not self._INTERPOLATE_SPRITES or alpha >= 1.0:
+            return self.__draw(screen)
+        positions = self.__interpolate(alpha)
+        dirty_rects = self.__draw(screen)
+        for sprite, position in positions:
+            sprite.rect.topleft = position
+        return dirty_rects
+
+    @final
+    def __interpolate(self, alpha: float):
+        """Move sprites between their previous and current positions, returning the current positions to restore."""
+        positions = []
+        for sprite, previous in self._previous_positions.items():
+            current = sprite.rect.topleft
+            if current != previous and self.sprites_all.has(sprite):
+                positions.append((sprite, current))
+                sprite.rect.topleft = (
+                    previous[0] + (current[0] - previous[0]) * alpha,
+                    previous[1] + (current[1] - previous[1]) * alpha,
+                )
+        return positions
+
+    @final
+    def __draw(self, screen: pygame.Surface):
         self._update_pre_draw()
-        screen.set_clip((self._CAMERA_OFFSET, self._CAMERA_SIZE or display.screen_size))
+        if self._stream:
+            self._stream.update(self._camera)
+        camera_area = pygame.Rect(self._CAMERA_OFFSET, self._CAMERA_SIZE or display.screen_size)
         offset = (
             self._CAMERA_OFFSET[0] - round(self._camera.x),
             self._CAMERA_OFFSET[1] - round(self._camera.y),
         )
-        screen.blit(self._background, offset)
+        dirty_rects = None
+        if self._DIRTY_RECTS or self._REDRAW_ON_CHANGE:
+            dirty_rects = self.__get_dirty_rects(screen, offset)
+        if dirty_rects and not self._DIRTY_RECTS:
+            # without _DIRTY_RECTS, any change means redrawing the whole screen
+            dirty_rects = None
+        if dirty_rects is None:
+            self.__draw_area(screen, offset, camera_area)
+            screen.set_clip(None)
+            self._draw_post_camera(screen)
+            return None
+        for dirty_rect in dirty_rects:
+            dirty_camera_area = camera_area.clip(dirty_rect)
+            if dirty_camera_area:
+                self.__draw_area(screen, offset, dirty_camera_area)
+            screen.set_clip(dirty_rect)
+            self._draw_post_camera(screen)
+        screen.set_clip(None)
+        return dirty_rects
+
+    @final
+    def __draw_area(self, screen: pygame.Surface, offset: tuple[int, int], area: pygame.Rect):
+        screen.set_clip(area)
+        if isinstance(self._background, ChunkedBackground):
+            self._background.draw(screen, offset, area)
+        else:
+            screen.blit(self._background, offset)
         self._draw_pre_sprites(screen, offset)
-        self.sprites_all.draw_offset(screen, offset)
+        self.sprites_all.draw_offset(screen, offset, area.move(-offset[0], -offset[1]))
         for sprite in self._sprites_game.sprites():
             sprite.draw_dynamic(screen, offset)
         self._draw_post_sprites(screen, offset)
-        screen.set_clip(None)
-        self._draw_post_camera(screen)
+
+    @final
+    def __get_dirty_rects(self, screen: pygame.Surface, offset: tuple[int, int]):
+        """Get the areas of the screen that need to be redrawn, or None if the whole screen does."""
+        drawn_sprites = {
+            sprite: (
+                sprite.image,
+                (
+                    round(sprite.rect.x) + offset[0],
+                    round(sprite.rect.y) + offset[1],
+                    sprite.image.get_width(),
+                    sprite.image.get_height(),
+                ),
+            )
+            for sprite
+            in self.sprites_all.sprites()
+        }
+        old_drawn_sprites = self._dirty_sprites
+        self._dirty_sprites = drawn_sprites
+        dirty_rects = self._dirty_rects
+        self._dirty_rects = []
+        if screen is not self._dirty_surface or offset != self._dirty_offset:
+            # a different surface or a moved camera means nothing drawn before can be kept
+            self._dirty_surface = screen
+            self._dirty_offset = offset
+            return None
+        # sprites that moved, changed image, were added, or were removed
+        for sprite, drawn in drawn_sprites.items():
+            old_drawn = old_drawn_sprites.pop(sprite, None)
+            if old_drawn != drawn:
+                dirty_rects.append(pygame.Rect(drawn[1]))
+                if old_drawn is not None:
+                    dirty_rects.append(pygame.Rect(old_drawn[1]))
+        for old_drawn in old_drawn_sprites.values():
+            dirty_rects.append(pygame.Rect(old_drawn[1]))
+        screen_rect = screen.get_rect()
+        merged_rects: list[pygame.Rect] = []
+        for dirty_rect in dirty_rects:
+            dirty_rect = dirty_rect.clip(screen_rect)
+            if not dirty_rect:
+                continue
+            # merge overlapping areas so nothing is drawn twice
+            i = dirty_rect.collidelist(merged_rects)
+            while i != -1:
+                dirty_rect.union_ip(merged_rects.pop(i))
+                i = dirty_rect.collidelist(merged_rects)
+            merged_rects.append(dirty_rect)
+        return merged_rects
+
+    @final
+    def invalidate(self, rect: pygame.typing.RectLike | None = None):
+        """Mark an area of the screen to be redrawn, or the whole screen if rect is None.
+        With _DIRTY_RECTS set, sprites moving, changing image, or being added or removed are found automatically,
+        anything else that changes what is drawn (the background, images drawn on, dynamic drawing) needs this.
+        The same goes for _REDRAW_ON_CHANGE, where any area being invalidated means the whole screen is redrawn.
+        Without either set the whole screen is always redrawn, so there is nothing to track."""
+        self._is_draw_pending = True
+        if not self._DIRTY_RECTS and not self._REDRAW_ON_CHANGE:
+            return
+        if rect is None:
+            self._dirty_surface = None
+        else:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    @final
+    def get_update_policy(self):
+        return self._UPDATE_POLICY
+
+    @final
+    def get_update_rate(self):
+        return self._UPDATE_RATE
+
+    @final
+    def is_draw_pending(self):
+        """Check if this mode has been invalidated (or never drawn) since it was last drawn,
+        so what is on screen doesn't show it yet."""
+        return self._is_draw_pending
+
+    @final
+    def get_wait_time(self):
+        """For EVENT_DRIVEN, get how many milliseconds the game can wait for input before this mode needs to update,
+        or None to wait for input however long it takes."""
+        return self._get_wait_time()
 
     @final
     def cleanup(self):
         for sprites in ((self.sprites_all, self._sprites_game, self._sprites_input)
-                + tuple(self._map_sprites_static_collide.values())):
+                + tuple(self._map_sprites_static_collide.values())
+                + tuple(self._map_sprites_class.values())):
             # we can't just kill the sprites since we might be reusing them between modes
             sprites.empty()
+        self._sleeping_sprites.clear()
+        self._sleeping_index.clear()
+        self._collide_cache.clear()
+        self._collide_touching.clear()
+        self._query_index.clear()
+        self._query_order = None
+        self._previous_positions.clear()
+        self._dirty_surface = None
+        self._dirty_sprites.clear()
+        self._dirty_rects.clear()
+        if self._stream:
+            self._stream.stop()
         self._cleanup()
 
     def _take_event(self, event: pygame.event.Event):
@@ -178,6 +944,11 @@ class ModeBase(abc.ABC):
         """Handle drawing onto screen after camera-aware drawing is done."""
         pass
 
+    def _get_wait_time(self) -> int | None:
+        """With _UPDATE_POLICY set to EVENT_DRIVEN, return the milliseconds until this mode next needs to update
+        without input, like for a timer running out, or None if it only changes on input."""
+        return None
+
     def _cleanup(self):
         """Handle any additional cleanup this mode will need when it's ended."""
         pass
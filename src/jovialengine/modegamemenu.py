@@ -9,7 +9,7 @@ from . import display
 from . import gameinput
 from . import utility
 from .fontwrap import get_default_font_wrap
-from .modebase import ModeBase
+from .modebase import ModeBase, UpdatePolicy
 from .save import Save
 from .saveable import Saveable
 
@@ -30,6 +30,8 @@ class ModeGameMenu(ModeBase, abc.ABC):
     _BACKGROUND_COLOR = (0, 0, 0)
     _MENU_CHAR_WIDTH = 40
     _SHARED_DISP_TEXT = "Options:\nESC) Go Back\n"
+    _REDRAW_ON_CHANGE = True
+    _UPDATE_POLICY = UpdatePolicy.EVENT_DRIVEN
 
     __slots__ = (
         '_MENU_WIDTH',
@@ -325,6 +327,10 @@ class ModeGameMenuSave(ModeGameMenu):
         if self._cursor_timer >= self._CURSOR_TIME:
             self._cursor_switch = not self._cursor_switch
             self._cursor_timer -= self._CURSOR_TIME
+            self.invalidate()
+
+    def _get_wait_time(self):
+        return self._CURSOR_TIME - self._cursor_timer
 
     def _draw_post_camera(self, screen):
         disp_text = self._SHARED_DISP_TEXT
@@ -581,9 +587,18 @@ class ModeGameMenuControls(ModeGameMenuList):
 
     def _update_pre_sprites(self, dt):
         if self._state == self.STATE_CHOOSE_INPUT:
+            seconds_left = self._selection_timer // 1000
             self._selection_timer -= dt
             if self._selection_timer <= 0:
                 self._state = self.STATE_CHOOSE_EVENT
+            if self._selection_timer // 1000 != seconds_left:
+                self.invalidate()
+
+    def _get_wait_time(self):
+        if self._state == self.STATE_CHOOSE_INPUT:
+            # until the seconds left shown changes
+            return self._selection_timer % 1000 + 1
+        return None
 
     def _draw_post_camera(self, screen):
         disp_text = self._SHARED_DISP_TEXT
@@ -0,0 +1,69 @@
+from typing import TYPE_CHECKING
+from collections.abc import Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from .gamesprite import GameSprite
+
+
+# number of sprites compared against all others at once, to bound memory use
+_CIRCLE_BLOCK_SIZE = 256
+
+
+def can_vectorize():
+    """Check whether vectorized collision checks are available (requires numpy)."""
+    return numpy is not None
+
+
+def get_circle_collisions(sprites: Sequence[GameSprite]):
+    """Get pairs of sprites with collision radii that are interested in each other and collide.
+    Uses the same circle check as GameSprite.does_collide, done for all pairs at once.
+    Pairs are ordered as they would be by looping over every pair of sprites in order."""
+    count = len(sprites)
+    if count < 2:
+        return []
+    sprite_classes = list(dict.fromkeys(type(sprite) for sprite in sprites))
+    class_indexes = {
+        sprite_cls: i
+        for i, sprite_cls
+        in enumerate(sprite_classes)
+    }
+    interests = numpy.array(
+        [
+            [
+                bool(sprite_cls0.collides_with_bits & sprite_cls1.collision_bits
+                     or sprite_cls1.collides_with_bits & sprite_cls0.collision_bits)
+                for sprite_cls1
+                in sprite_classes
+            ]
+            for sprite_cls0
+            in sprite_classes
+        ],
+        dtype=bool
+    )
+    # no rounding since circle collisions doesn't match exact pixels anyway
+    centerx = numpy.fromiter((sprite.rect.centerx for sprite in sprites), dtype=numpy.float64, count=count)
+    centery = numpy.fromiter((sprite.rect.centery for sprite in sprites), dtype=numpy.float64, count=count)
+    radius = numpy.fromiter((sprite.radius for sprite in sprites), dtype=numpy.float64, count=count)
+    class_index = numpy.fromiter((class_indexes[type(sprite)] for sprite in sprites), dtype=numpy.intp, count=count)
+    result: list[tuple[GameSprite, GameSprite]] = []
+    for start in range(0, count - 1, _CIRCLE_BLOCK_SIZE):
+        stop = min(start + _CIRCLE_BLOCK_SIZE, count)
+        # compare rows start:stop against columns start:count, keeping only column > row
+        dx = centerx[start:] - centerx[start:stop, numpy.newaxis]
+        dy = centery[start:] - centery[start:stop, numpy.newaxis]
+        reach = radius[start:] + radius[start:stop, numpy.newaxis]
+        hits = dx * dx + dy * dy <= reach * reach
+        hits &= interests[class_index[start:stop, numpy.newaxis], class_index[start:]]
+        hits = numpy.triu(hits, 1)
+        rows, columns = numpy.nonzero(hits)
+        result.extend(
+            (sprites[start + row], sprites[start + column])
+            for row, column
+            in zip(rows.tolist(), columns.tolist())
+        )
+    return result
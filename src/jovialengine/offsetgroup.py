@@ -3,16 +3,39 @@ import pygame
 
 class OffsetGroup(pygame.sprite.LayeredUpdates):
     """A sprite group for drawing sprites, in layers, offset by some amount."""
-    def draw_offset(self, surface: pygame.Surface, offset: pygame.typing.IntPoint=(0,0)):
-        sprite_sequence = [
-            (
-                sprite.image,
+    def draw_offset(
+            self,
+            surface: pygame.Surface,
+            offset: pygame.typing.IntPoint=(0,0),
+            camera: pygame.typing.RectLike | None=None
+    ):
+        """Draw the sprites offset by some amount.
+        If camera is set, sprites whose images fall outside of it are skipped.
+        The camera is in the same coordinates as the sprites, before the offset."""
+        if camera is None:
+            sprite_sequence = [
                 (
-                    round(sprite.rect.x) + offset[0],
-                    round(sprite.rect.y) + offset[1],
+                    sprite.image,
+                    (
+                        round(sprite.rect.x) + offset[0],
+                        round(sprite.rect.y) + offset[1],
+                    )
                 )
-            )
-            for sprite
-            in self.sprites()
-        ]
+                for sprite
+                in self.sprites()
+            ]
+        else:
+            camera = pygame.FRect(camera)
+            # rounding so that the visible area matches the apparent (drawn) position of the camera
+            left = round(camera.x)
+            top = round(camera.y)
+            right = left + camera.width
+            bottom = top + camera.height
+            sprite_sequence = []
+            for sprite in self.sprites():
+                x = round(sprite.rect.x)
+                y = round(sprite.rect.y)
+                if x < right and y < bottom and x + sprite.image.get_width() > left \
+                        and y + sprite.image.get_height() > top:
+                    sprite_sequence.append((sprite.image, (x + offset[0], y + offset[1])))
         surface.fblits(sprite_sequence)
@@ -0,0 +1,159 @@
+import math
+
+import pygame
+
+from . import load
+
+
+class TiledMask(object):
+    """A large mask split into fixed-size tiles.
+    Fully empty tiles are stored as None and fully solid tiles share one cached filled mask,
+    so only tiles along the boundaries of the mask keep their own pixels.
+    Checking a small mask against it only looks at the tiles under that mask."""
+    __slots__ = (
+        '_size',
+        '_tile_size',
+        '_tiles',
+    )
+
+    def __init__(self, mask: pygame.Mask, tile_size: int):
+        self._set_up(mask.get_size(), tile_size)
+        for tile_y, tile_row in enumerate(self._tiles):
+            for tile_x in range(len(tile_row)):
+                tile_pos = (tile_x * tile_size, tile_y * tile_size)
+                tile = pygame.Mask(self._get_tile_size(tile_pos))
+                tile.draw(mask, (-tile_pos[0], -tile_pos[1]))
+                tile_row[tile_x] = self._get_tile(tile)
+
+    @classmethod
+    def empty(cls, size: tuple[int, int], tile_size: int):
+        """Create a TiledMask with no bits set, without allocating a mask of the full size.
+        Tiles can then be filled in with set_tile."""
+        result = cls.__new__(cls)
+        result._set_up(size, tile_size)
+        return result
+
+    def _set_up(self, size: tuple[int, int], tile_size: int):
+        if tile_size < 1:
+            raise ValueError("error: tile_size must be positive")
+        self._size = size
+        self._tile_size = tile_size
+        self._tiles: list[list[pygame.Mask | None]] = [
+            [None] * math.ceil(size[0] / tile_size)
+            for _
+            in range(math.ceil(size[1] / tile_size))
+        ]
+
+    def _get_tile_size(self, pos: tuple[int, int]):
+        return (
+            min(self._tile_size, self._size[0] - pos[0]),
+            min(self._tile_size, self._size[1] - pos[1]),
+        )
+
+    @staticmethod
+    def _get_tile(tile: pygame.Mask):
+        size = tile.get_size()
+        count = tile.count()
+        if count == 0:
+            return None
+        if count == size[0] * size[1]:
+            return load.mask_filled(size)
+        return tile
+
+    def set_tile(self, tile_pos: tuple[int, int], tile: pygame.Mask | None):
+        """Replace the tile at a tile position (in tiles, not pixels), or clear it if tile is None.
+        The tile is cropped to the size of the tile position."""
+        if tile is not None:
+            size = self._get_tile_size((tile_pos[0] * self._tile_size, tile_pos[1] * self._tile_size))
+            if tile.get_size() != size:
+                cropped = pygame.Mask(size)
+                cropped.draw(tile, (0, 0))
+                tile = cropped
+            tile = self._get_tile(tile)
+        self._tiles[tile_pos[1]][tile_pos[0]] = tile
+
+    def get_size(self):
+        return self._size
+
+    def get_at(self, pos: tuple[int, int]):
+        """Get the bit at a position, like Mask.get_at."""
+        if not (0 <= pos[0] < self._size[0] and 0 <= pos[1] < self._size[1]):
+            raise IndexError("error: position out of bounds")
+        tile = self._tiles[pos[1] // self._tile_size][pos[0] // self._tile_size]
+        if tile is None:
+            return 0
+        return tile.get_at((pos[0] % self._tile_size, pos[1] % self._tile_size))
+
+    def overlap(self, other: pygame.Mask, offset: tuple[int, int]):
+        """Get the first point of overlap with another mask, or None, like Mask.overlap.
+        The offset is the position of other relative to this mask."""
+        other_size = other.get_size()
+        left = max(offset[0], 0)
+        top = max(offset[1], 0)
+        right = min(offset[0] + other_size[0], self._size[0])
+        bottom = min(offset[1] + other_size[1], self._size[1])
+        if left >= right or top >= bottom:
+            return None
+        for tile_y in range(top // self._tile_size, (bottom - 1) // self._tile_size + 1):
+            tile_row = self._tiles[tile_y]
+            for tile_x in range(left // self._tile_size, (right - 1) // self._tile_size + 1):
+                tile = tile_row[tile_x]
+                if tile is None:
+                    continue
+                tile_pos = (tile_x * self._tile_size, tile_y * self._tile_size)
+                point = tile.overlap(other, (offset[0] - tile_pos[0], offset[1] - tile_pos[1]))
+                if point:
+                    return point[0] + tile_pos[0], point[1] + tile_pos[1]
+        return None
+
+    def raycast(self, start: pygame.typing.Point, end: pygame.typing.Point, max_distance: float = math.inf):
+        """Get the first set bit going from start to end a pixel at a time, or None if there isn't one.
+        Empty tiles are skipped over, and the walk stops once it is past max_distance from start."""
+        start = pygame.Vector2(start)
+        end = pygame.Vector2(end)
+        delta = end - start
+        steps = math.ceil(max(abs(delta.x), abs(delta.y)))
+        if steps == 0:
+            pos = (math.floor(start.x), math.floor(start.y))
+            if 0 <= pos[0] < self._size[0] and 0 <= pos[1] < self._size[1] and self.get_at(pos):
+                return pos
+            return None
+        # only walk the part of the line within the mask, and within max_distance
+        # (plus a bit, since points are rounded down to pixels)
+        t_start = 0.0
+        t_end = min(1.0, (max_distance + 2) / delta.length())
+        for axis in (0, 1):
+            if delta[axis] == 0:
+                if not 0 <= start[axis] < self._size[axis]:
+                    return None
+                continue
+            t_low = -start[axis] / delta[axis]
+            t_high = (self._size[axis] - start[axis]) / delta[axis]
+            t_start = max(t_start, min(t_low, t_high))
+            t_end = min(t_end, max(t_low, t_high))
+        if t_start > t_end:
+            return None
+        i = math.floor(t_start * steps)
+        last = min(math.ceil(t_end * steps), steps)
+        while i <= last:
+            point = start.lerp(end, i / steps)
+            pos = (math.floor(point.x), math.floor(point.y))
+            if not (0 <= pos[0] < self._size[0] and 0 <= pos[1] < self._size[1]):
+                i += 1
+                continue
+            tile_pos = (pos[0] // self._tile_size, pos[1] // self._tile_size)
+            tile = self._tiles[tile_pos[1]][tile_pos[0]]
+            if tile is None:
+                # skip to about where the line leaves this tile, the next pass checks which tile it is in
+                t_exit = 1.0
+                for axis in (0, 1):
+                    if delta[axis] > 0:
+                        t_exit = min(t_exit, ((tile_pos[axis] + 1) * self._tile_size - start[axis]) / delta[axis])
+                    elif delta[axis] < 0:
+                        t_exit = min(t_exit, (tile_pos[axis] * self._tile_size - start[axis]) / delta[axis])
+                i = max(i + 1, math.floor(t_exit * steps))
+                continue
+            if tile.get_at((pos[0] - tile_pos[0] * self._tile_size, pos[1] - tile_pos[1] * self._tile_size)):
+                return pos
+            i += 1
+        return None
@@ -0,0 +1,193 @@
+import math
+import queue
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+import pygame
+
+
+def load_image_chunk(filename: str):
+    """Loads an image for a chunk, or None if there is no file for the chunk.
+    Safe to call from a background thread, so the result still needs to be converted."""
+    try:
+        return pygame.image.load(filename)
+    except FileNotFoundError:
+        return None
+
+
+def load_mask_chunk(filename: str, alpha_or_colorkey: bool | pygame.typing.ColorLike):
+    """Loads a mask for a chunk, or None if there is no file for the chunk.
+    Safe to call from a background thread."""
+    surface = load_image_chunk(filename)
+    if surface is None:
+        return None
+    if alpha_or_colorkey is False:
+        return pygame.mask.Mask(surface.get_size(), True)
+    if alpha_or_colorkey is not True:
+        surface.set_colorkey(alpha_or_colorkey)
+    return pygame.mask.from_surface(surface)
+
+
+def _get_memory_size(data):
+    if isinstance(data, pygame.Surface):
+        return data.get_width() * data.get_height() * data.get_bytesize()
+    if isinstance(data, pygame.Mask):
+        size = data.get_size()
+        return size[0] * size[1] // 8
+    return 0
+
+
+class WorldStream(object):
+    """Loads chunks of a large world from disk on a background thread as an area (usually the camera) moves around.
+    Each layer of the world has a function to load the data for a chunk, run on the background thread,
+    and functions to add and remove loaded data, run on the main thread during update().
+    Chunks within margin of the area are loaded ahead of time, chunks inside the area are loaded right away if needed,
+    and chunks that have been out of range the longest are removed while loaded data is over the memory budget."""
+    __slots__ = (
+        '_size',
+        '_chunk_size',
+        '_margin',
+        '_memory_budget',
+        '_layers',
+        '_loaded',
+        '_memory_used',
+        '_wanted',
+        '_pending',
+        '_requests',
+        '_results',
+        '_thread',
+    )
+
+    def __init__(self, size: tuple[int, int], chunk_size: int, margin: int, memory_budget: int):
+        if chunk_size < 1:
+            raise ValueError("error: chunk_size must be positive")
+        self._size = size
+        self._chunk_size = chunk_size
+        self._margin = margin
+        self._memory_budget = memory_budget
+        self._layers: list[tuple[Callable, Callable, Callable]] = []
+        # loaded chunks as (layer, chunk x, chunk y), least recently in range first, with the memory they use
+        # (None for chunks with nothing there)
+        self._loaded: OrderedDict[tuple[int, int, int], int | None] = OrderedDict()
+        self._memory_used = 0
+        # read by the background thread, only ever replaced, never changed
+        self._wanted: frozenset[tuple[int, int, int]] = frozenset()
+        self._pending: set[tuple[int, int, int]] = set()
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        self._results: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+
+    def add_layer(
+            self,
+            load_chunk: Callable[[tuple[int, int]], object | None],
+            add_chunk: Callable[[tuple[int, int], object], None],
+            remove_chunk: Callable[[tuple[int, int]], None]
+    ):
+        """Add a layer of chunks.
+        load_chunk gets the data for a chunk position (or None if there is nothing there),
+        add_chunk and remove_chunk are called with the chunk position as data is loaded and removed."""
+        self._layers.append((load_chunk, add_chunk, remove_chunk))
+
+    def get_memory_used(self):
+        """Get the approximate number of bytes used by loaded chunks."""
+        return self._memory_used
+
+    def is_loaded(self, layer: int, chunk_pos: tuple[int, int]):
+        return (layer, chunk_pos[0], chunk_pos[1]) in self._loaded
+
+    def _get_keys(self, area: pygame.FRect):
+        left = max(math.floor(area.left / self._chunk_size), 0)
+        top = max(math.floor(area.top / self._chunk_size), 0)
+        right = min(math.ceil(area.right / self._chunk_size), math.ceil(self._size[0] / self._chunk_size))
+        bottom = min(math.ceil(area.bottom / self._chunk_size), math.ceil(self._size[1] / self._chunk_size))
+        return [
+            (layer, chunk_x, chunk_y)
+            for layer in range(len(self._layers))
+            for chunk_y in range(top, bottom)
+            for chunk_x in range(left, right)
+        ]
+
+    def update(self, area: pygame.typing.RectLike):
+        """Add chunks that finished loading, request chunks near the area, and remove chunks over the memory budget."""
+        area = pygame.FRect(area)
+        self.__take_results()
+        wanted = self._get_keys(area.inflate(self._margin * 2, self._margin * 2))
+        self._wanted = frozenset(wanted)
+        for key in self._get_keys(area):
+            if key not in self._loaded:
+                # the area got ahead of the background thread
+                self.__add(key, self._layers[key[0]][0]((key[1], key[2])))
+        for key in wanted:
+            if key in self._loaded:
+                self._loaded.move_to_end(key)
+            elif key not in self._pending:
+                self._pending.add(key)
+                self._requests.put(key)
+        if self._pending and self._thread is None:
+            self._thread = threading.Thread(target=self._work, args=(self._requests,), daemon=True)
+            self._thread.start()
+        self.__evict()
+
+    def __take_results(self):
+        while True:
+            try:
+                key, was_loaded, data, error = self._results.get_nowait()
+            except queue.Empty:
+                return
+            self._pending.discard(key)
+            if error is not None:
+                raise error
+            if was_loaded and key in self._wanted and key not in self._loaded:
+                self.__add(key, data)
+
+    def __add(self, key: tuple[int, int, int], data):
+        if data is None:
+            self._loaded[key] = None
+            return
+        self._layers[key[0]][1]((key[1], key[2]), data)
+        memory = _get_memory_size(data)
+        self._loaded[key] = memory
+        self._memory_used += memory
+
+    def __remove(self, key: tuple[int, int, int]):
+        memory = self._loaded.pop(key)
+        if memory is not None:
+            self._memory_used -= memory
+            self._layers[key[0]][2]((key[1], key[2]))
+
+    def __evict(self):
+        for key in tuple(self._loaded):
+            if self._memory_used <= self._memory_budget:
+                return
+            if key not in self._wanted:
+                self.__remove(key)
+
+    def _work(self, requests: queue.SimpleQueue):
+        while True:
+            key = requests.get()
+            if key is None:
+                return
+            if key not in self._wanted:
+                # skip chunks that went out of range while waiting
+                self._results.put((key, False, None, None))
+                continue
+            try:
+                self._results.put((key, True, self._layers[key[0]][0]((key[1], key[2])), None))
+            except Exception as e:
+                self._results.put((key, False, None, e))
+
+    def stop(self):
+        """Stop the background thread and remove all loaded chunks.
+        Waits for any chunk being loaded to finish, so nothing is loaded after this returns."""
+        self._wanted = frozenset()
+        if self._thread is not None:
+            self._requests.put(None)
+            # requests left in the queue are skipped now that nothing is wanted
+            self._thread.join()
+            self._thread = None
+        self._pending.clear()
+        self._results = queue.SimpleQueue()
+        self._requests = queue.SimpleQueue()
+        for key in tuple(self._loaded):
+            self.__remove(key)
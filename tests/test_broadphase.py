@@ -0,0 +1,115 @@
+import unittest
+import itertools
+
+import pygame
+
+from jovialengine.gamesprite import GameSprite
+import jovialengine.broadphase as broadphase
+
+
+class TestSpriteRect(GameSprite):
+    _IMAGE_LOCATION = './assets/gfx/4x4_image.png'
+    _ALPHA_OR_COLORKEY = (255, 0, 255)
+
+class TestSpriteCircle(GameSprite):
+    _IMAGE_LOCATION = './assets/gfx/4x4_image.png'
+    _ALPHA_OR_COLORKEY = (255, 0, 255)
+    _COLLISION_RADIUS = 4
+
+class TestBroadphase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.display.set_mode((1, 1), pygame.NOFRAME)
+
+    def test_get_bounds_rect(self):
+        # Arrange
+        sprite = TestSpriteRect(topleft=(2.6, 3.4))
+        # Act
+        bounds = broadphase.get_bounds(sprite)
+        # Assert
+        self.assertEqual(bounds, (3, 3, 7, 7))
+
+    def test_get_bounds_circle(self):
+        # Arrange
+        sprite = TestSpriteCircle(center=(10, 10))
+        # Act
+        bounds = broadphase.get_bounds(sprite)
+        # Assert
+        self.assertEqual(bounds, (6, 6, 14, 14))
+
+    def test_spatial_hash_get_pairs_far(self):
+        # Arrange
+        sprites = [
+            TestSpriteRect(topleft=(0, 0)),
+            TestSpriteRect(topleft=(100, 100)),
+        ]
+        spatial_hash = broadphase.SpatialHash(16)
+        # Act
+        pairs = spatial_hash.get_pairs(sprites)
+        # Assert
+        self.assertEqual(pairs, [])
+
+    def test_spatial_hash_get_pairs_matches_all_pairs(self):
+        # Arrange
+        sprites = [
+            TestSpriteRect(topleft=(x * 3, y * 5))
+            for x in range(10)
+            for y in range(6)
+        ] + [
+            TestSpriteCircle(center=(x * 7, 9))
+            for x in range(5)
+        ]
+        spatial_hash = broadphase.SpatialHash(8)
+        # Act
+        pairs = spatial_hash.get_pairs(sprites)
+        # Assert
+        expected = [
+            pair
+            for pair
+            in itertools.combinations(sprites, 2)
+            if pair[0].does_collide(pair[1])
+        ]
+        colliding = [
+            pair
+            for pair
+            in pairs
+            if pair[0].does_collide(pair[1])
+        ]
+        self.assertEqual(colliding, expected)
+
+    def test_sweep_and_prune_get_pairs_matches_all_pairs(self):
+        # Arrange
+        sprites = [
+            TestSpriteRect(topleft=(x * 3, y * 5))
+            for x in range(10)
+            for y in range(6)
+        ] + [
+            TestSpriteCircle(center=(x * 7, 9))
+            for x in range(5)
+        ]
+        sweep_and_prune = broadphase.SweepAndPrune(0)
+        sweep_and_prune.get_pairs(sprites)
+        for i, sprite in enumerate(sprites):
+            sprite.rect.x += (i % 7) - 3
+        del sprites[4]
+        sprites.append(TestSpriteRect(topleft=(12, 12)))
+        # Act
+        pairs = sweep_and_prune.get_pairs(sprites)
+        # Assert
+        expected = [
+            pair
+            for pair
+            in itertools.combinations(sprites, 2)
+            if pair[0].does_collide(pair[1])
+        ]
+        colliding = [
+            pair
+            for pair
+            in pairs
+            if pair[0].does_collide(pair[1])
+        ]
+        self.assertEqual(colliding, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
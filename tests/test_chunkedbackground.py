@@ -0,0 +1,74 @@
+import unittest
+
+import pygame
+
+from jovialengine.chunkedbackground import ChunkedBackground
+
+
+class TestChunkedBackground(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.display.set_mode((1, 1), pygame.NOFRAME)
+
+    def test_fill(self):
+        # Arrange
+        background = ChunkedBackground((100, 100), 16)
+        background.set_at((5, 5), pygame.Color('white'))
+        # Act
+        background.fill(pygame.Color('red'))
+        # Assert
+        self.assertEqual(background.get_chunk_count(), 0)
+        self.assertEqual(background.get_at((5, 5)), pygame.Color('red'))
+
+    def test_set_at(self):
+        # Arrange
+        background = ChunkedBackground((100, 100), 16)
+        # Act
+        background.set_at((99, 99), pygame.Color('white'))
+        # Assert
+        self.assertEqual(background.get_chunk_count(), 1)
+        self.assertEqual(background.get_at((99, 99)), pygame.Color('white'))
+        self.assertEqual(background.get_at((98, 99)), pygame.Color('black'))
+
+    def test_blit(self):
+        # Arrange
+        background = ChunkedBackground((100, 100), 16)
+        source = pygame.Surface((4, 4))
+        source.fill(pygame.Color('white'))
+        # Act
+        background.blit(source, (14, 30))
+        # Assert
+        self.assertEqual(background.get_chunk_count(), 4)
+        self.assertEqual(background.get_at((14, 30)), pygame.Color('white'))
+        self.assertEqual(background.get_at((17, 33)), pygame.Color('white'))
+        self.assertEqual(background.get_at((18, 33)), pygame.Color('black'))
+
+    def test_draw(self):
+        # Arrange
+        background = ChunkedBackground((40, 30), 8)
+        background.fill(pygame.Color('red'))
+        expected_background = pygame.Surface((40, 30))
+        expected_background.fill(pygame.Color('red'))
+        source = pygame.Surface((5, 5))
+        source.fill(pygame.Color('white'))
+        for pos in ((3, 3), (20, 14), (36, 27)):
+            background.blit(source, pos)
+            expected_background.blit(source, pos)
+        screen = pygame.Surface((20, 20))
+        expected_screen = pygame.Surface((20, 20))
+        area = pygame.Rect(2, 2, 16, 16)
+        offset = (-6, -10)
+        # Act
+        screen.set_clip(area)
+        background.draw(screen, offset, area)
+        # Assert
+        expected_screen.set_clip(area)
+        expected_screen.blit(expected_background, offset)
+        self.assertEqual(
+            pygame.image.tobytes(screen, 'RGB'),
+            pygame.image.tobytes(expected_screen, 'RGB')
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
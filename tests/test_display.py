@@ -1,3 +1,4 @@
+import time
 import unittest
 
 import pygame
@@ -97,6 +98,58 @@ class TestDisplay(unittest.TestCase):
         # Assert
         self.assertFalse(result)
 
+    @unittest.skipUnless(display.sdl2_video, "requires pygame._sdl2")
+    def test_scale_draw_renderer(self):
+        # Arrange
+        self.set_up_windowed()
+        display._disp_res = (960, 720)
+        display._title = "test"
+        display._window_icon = None
+        display._mouse_visible = True
+        display._set_window(display._disp_res, (0, 0), False)
+        display.screen = pygame.Surface(display.screen_size)
+        display.screen.fill(pygame.Color('red'))
+        # Act
+        display.scale_draw()
+        result = display._renderer.to_surface()
+        display._reset_display()
+        display.screen = None
+        # Assert
+        self.assertEqual(result.get_at((0, 0)), pygame.Color('red'))
+        self.assertEqual(result.get_at((959, 719)), pygame.Color('red'))
+
+    def test_scale_draw_render_thread(self):
+        # Arrange
+        self.set_up_windowed()
+        display._disp_res = (960, 720)
+        display._disp_screen = pygame.display.set_mode(display._disp_res)
+        display._use_render_thread = True
+        display.screen = pygame.Surface(display.screen_size)
+        display.screen.fill(pygame.Color('red'))
+        display.reset_input_latency()
+        # Act
+        display.scale_draw(None, time.perf_counter_ns())
+        display.finish_present()
+        first_result = display._disp_screen.copy()
+        display.screen.fill(pygame.Color('blue'), (0, 0, 10, 10))
+        display.scale_draw([pygame.Rect(0, 0, 10, 10)], time.perf_counter_ns())
+        display.stop()
+        result = display._disp_screen.copy()
+        latency = display.get_input_latency()
+        display._use_render_thread = False
+        display.screen = None
+        # Assert
+        self.assertEqual(first_result.get_at((0, 0)), pygame.Color('red'))
+        self.assertEqual(first_result.get_at((959, 719)), pygame.Color('red'))
+        self.assertEqual(result.get_at((0, 0)), pygame.Color('blue'))
+        self.assertEqual(result.get_at((29, 29)), pygame.Color('blue'))
+        self.assertEqual(result.get_at((30, 30)), pygame.Color('red'))
+        self.assertEqual(result.get_at((959, 719)), pygame.Color('red'))
+        self.assertGreater(latency[0], 0)
+        self.assertGreater(latency[1], 0)
+        self.assertIsNone(display._present_screen)
+        self.assertIsNone(display._scaled_screen)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+
+from jovialengine.framescheduler import FramePolicy, FrameScheduler
+
+
+class FakeClock(object):
+    """Stands in for time.perf_counter_ns and time.sleep, with sleeps ending oversleep nanoseconds late
+    and each spin (a sleep of 0) taking spin_step nanoseconds."""
+    __slots__ = (
+        'now',
+        'oversleep',
+        'spin_step',
+        'sleeps',
+    )
+
+    def __init__(self, oversleep: int = 0, spin_step: int = 10_000):
+        self.now = 0
+        self.oversleep = oversleep
+        self.spin_step = spin_step
+        self.sleeps = []
+
+    def get_time(self):
+        return self.now
+
+    def sleep(self, seconds: float):
+        if seconds == 0:
+            self.now += self.spin_step
+            return
+        self.sleeps.append(seconds)
+        self.now += round(seconds * 1_000_000_000) + self.oversleep
+
+
+class TestFrameScheduler(unittest.TestCase):
+    @staticmethod
+    def tick_frames(policy: FramePolicy, clock: FakeClock):
+        scheduler = FrameScheduler(policy, get_time=clock.get_time, sleep=clock.sleep)
+        scheduler.tick(100)
+        start = clock.now
+        total_dt = sum(scheduler.tick(100) for _ in range(10))
+        elapsed = (clock.now - start) // 1_000_000
+        return scheduler, total_dt, elapsed
+
+    def test_tick_busy(self):
+        # Arrange
+        clock = FakeClock(1_000_000)
+        # Act
+        scheduler, total_dt, elapsed = self.tick_frames(FramePolicy.BUSY, clock)
+        # Assert
+        self.assertEqual(elapsed, 100)
+        self.assertEqual(total_dt, 100)
+        self.assertEqual(clock.sleeps, [])
+        self.assertEqual(scheduler.get_jitter(), (0.0, 0.0))
+
+    def test_tick_hybrid(self):
+        # Arrange
+        clock = FakeClock(1_000_000)
+        # Act
+        scheduler, total_dt, elapsed = self.tick_frames(FramePolicy.HYBRID, clock)
+        # Assert
+        self.assertEqual(elapsed, 100)
+        self.assertEqual(total_dt, 100)
+        # spinning can only end late by up to one spin step
+        self.assertLessEqual(scheduler.get_jitter()[1], clock.spin_step / 1_000_000)
+        self.assertLess(scheduler.get_spin_time(), FrameScheduler._MAX_SPIN_TIME / 2 / 1_000_000)
+        self.assertGreaterEqual(scheduler.get_spin_time(), FrameScheduler._MIN_SPIN_TIME / 1_000_000)
+
+    def test_tick_hybrid_late(self):
+        # Arrange
+        clock = FakeClock(3_000_000)
+        # Act
+        scheduler, total_dt, elapsed = self.tick_frames(FramePolicy.HYBRID, clock)
+        # Assert
+        self.assertEqual(elapsed, 100)
+        self.assertEqual(total_dt, 100)
+        self.assertEqual(scheduler.get_jitter()[1], 1.0)
+        self.assertGreater(scheduler.get_spin_time(), FrameScheduler._MAX_SPIN_TIME / 2 / 1_000_000)
+
+    def test_tick_sleep(self):
+        # Arrange
+        clock = FakeClock(1_000_000)
+        # Act
+        scheduler, total_dt, elapsed = self.tick_frames(FramePolicy.SLEEP, clock)
+        # Assert
+        self.assertEqual(elapsed, 101)
+        self.assertEqual(total_dt, 101)
+        self.assertEqual(len(clock.sleeps), 10)
+        self.assertEqual(scheduler.get_jitter(), (1.0, 1.0))
+
+    def test_tick_unlimited(self):
+        # Arrange
+        clock = FakeClock()
+        scheduler = FrameScheduler(get_time=clock.get_time, sleep=clock.sleep)
+        # Act
+        clock.now += 3_500_000
+        result = [scheduler.tick() for _ in range(3)]
+        # Assert
+        self.assertEqual(result, [3, 0, 0])
+        self.assertEqual(clock.now, 3_500_000)
+        self.assertEqual(scheduler.get_jitter(), (0, 0))
+
+    def test_jitter_target(self):
+        # Arrange
+        scheduler = FrameScheduler(FramePolicy.HYBRID, 2)
+        # Act
+        result = scheduler.get_jitter_target()
+        scheduler.set_jitter_target(0.25)
+        set_result = scheduler.get_jitter_target()
+        # Assert
+        self.assertEqual(result, 2.0)
+        self.assertEqual(set_result, 0.25)
+        self.assertEqual(scheduler._jitter_target, 250_000)
+
+    def test_tick_late_frame(self):
+        # Arrange
+        clock = FakeClock()
+        scheduler = FrameScheduler(FramePolicy.SLEEP, get_time=clock.get_time, sleep=clock.sleep)
+        scheduler.tick(100)
+        # Act
+        clock.now += 30_000_000
+        dt = scheduler.tick(100)
+        # Assert
+        self.assertEqual(dt, 30)
+        self.assertEqual(clock.sleeps, [])
+        self.assertEqual(clock.now, 30_000_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,69 @@
+import time
 import unittest
 
 import pygame
 
 import jovialengine.display as display
 import jovialengine.game as game
+from jovialengine.modebase import UpdatePolicy
+from mode import ModeTest
+
+
+class ModeTestThrottled(ModeTest):
+    _UPDATE_POLICY = UpdatePolicy.THROTTLED
+    _UPDATE_RATE = 20
+
+
+class ModeTestEventDriven(ModeTest):
+    _UPDATE_POLICY = UpdatePolicy.EVENT_DRIVEN
+
+    def _get_wait_time(self):
+        return 20
+
+
+class ModeTestEventDrivenLong(ModeTest):
+    _UPDATE_POLICY = UpdatePolicy.EVENT_DRIVEN
+
+    __slots__ = (
+        'update_log',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.update_log = []
+
+    def _update_pre_sprites(self, dt):
+        self.update_log.append(dt)
+
+    def _get_wait_time(self):
+        return 300
+
+
+class ModeTestUpdateLog(ModeTest):
+    __slots__ = (
+        'update_log',
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.update_log = []
+
+    def _update_pre_sprites(self, dt):
+        self.update_log.append(dt)
 
 
 class GameForTest(game.Game):
     def __init__(self):
         self.running = False
         self._is_first_loop = False
+        self._is_minimized = False
         self._joysticks = []
+        self.current_mode = None
+        self.max_dt = 5
+        self.max_catch_up = 250
+        self.fixed_dt = None
+        self._fixed_dt_time = 0
+        self._wait_time = 0
 
 
 class TestGame(unittest.TestCase):
@@ -23,6 +76,14 @@ class TestGame(unittest.TestCase):
         display._fullscreen_offset = None
         display.upscale = 3
         display.screen_size = (320, 240)
+        pygame.display.set_mode((1, 1), pygame.NOFRAME)
+
+    def setUp(self):
+        self.game_for_test._is_minimized = False
+        self.game_for_test.fixed_dt = None
+        self.game_for_test._fixed_dt_time = 0
+        self.game_for_test._wait_time = 0
+        display.max_framerate = 60
 
     def test__is_pause_event_QUIT(self):
         # Arrange
@@ -99,6 +160,150 @@ class TestGame(unittest.TestCase):
         # Assert
         self.assertFalse(result)
 
+    def test__filter_event_WINDOWMINIMIZED(self):
+        # Arrange
+        event_dict = {
+        }
+        event = pygame.event.Event(pygame.WINDOWMINIMIZED, event_dict)
+        # Act
+        result = self.game_for_test._filter_event(event)
+        # Assert
+        self.assertTrue(result)
+        self.assertTrue(self.game_for_test._is_minimized)
+
+    def test__update(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestUpdateLog()
+        # Act
+        result = self.game_for_test._update(12)
+        # Assert
+        self.assertEqual(self.game_for_test.current_mode.update_log, [5, 5, 2])
+        self.assertEqual(result, 1.0)
+
+    def test__update_catch_up(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestUpdateLog()
+        # Act
+        self.game_for_test._update(1000)
+        # Assert
+        self.assertEqual(self.game_for_test.current_mode.update_log, [5] * 50)
+
+    def test__update_catch_up_event_driven_wait(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestEventDrivenLong()
+        self.game_for_test.current_mode.draw(pygame.Surface(display.screen_size))
+        pygame.event.clear()
+        # Act
+        start = time.perf_counter_ns()
+        self.game_for_test._get_events()
+        waited = (time.perf_counter_ns() - start) // 1_000_000
+        self.game_for_test._update(waited, self.game_for_test._wait_time)
+        # Assert
+        self.assertGreaterEqual(waited, 299)
+        self.assertEqual(self.game_for_test._wait_time, 300)
+        self.assertEqual(sum(self.game_for_test.current_mode.update_log), waited)
+
+    def test__update_catch_up_planned(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestUpdateLog()
+        # Act
+        self.game_for_test._update(1000, 500)
+        # Assert
+        self.assertEqual(sum(self.game_for_test.current_mode.update_log), 750)
+
+    def test__update_fixed_dt(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestUpdateLog()
+        self.game_for_test.fixed_dt = 10
+        # Act
+        first_result = self.game_for_test._update(25)
+        second_result = self.game_for_test._update(3)
+        third_result = self.game_for_test._update(2)
+        # Assert
+        self.assertEqual(self.game_for_test.current_mode.update_log, [10, 10, 10])
+        self.assertEqual(first_result, 0.5)
+        self.assertEqual(second_result, 0.8)
+        self.assertEqual(third_result, 0.0)
+
+    def test__update_fixed_dt_catch_up(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestUpdateLog()
+        self.game_for_test.fixed_dt = 10
+        # Act
+        result = self.game_for_test._update(1000)
+        # Assert
+        self.assertEqual(self.game_for_test.current_mode.update_log, [10] * 25)
+        self.assertEqual(result, 0.0)
+
+    def test__get_framerate_continuous(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTest()
+        # Act
+        result = self.game_for_test._get_framerate()
+        # Assert
+        self.assertEqual(result, 60)
+
+    def test__get_framerate_throttled(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestThrottled()
+        # Act
+        result = self.game_for_test._get_framerate()
+        # Assert
+        self.assertEqual(result, 20)
+
+    def test__get_framerate_minimized(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestThrottled()
+        self.game_for_test._is_minimized = True
+        # Act
+        result = self.game_for_test._get_framerate()
+        # Assert
+        self.assertEqual(result, game.Game._MINIMIZED_UPDATE_RATE)
+
+    def test__get_events_event_driven(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestEventDriven()
+        self.game_for_test.current_mode.draw(pygame.Surface(display.screen_size))
+        pygame.event.clear()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a))
+        # Act
+        result = self.game_for_test._get_events()
+        # Assert
+        self.assertEqual([event.type for event in result], [pygame.KEYDOWN])
+
+    def test__get_events_event_driven_timeout(self):
+        # Arrange
+        self.game_for_test.current_mode = ModeTestEventDriven()
+        self.game_for_test.current_mode.draw(pygame.Surface(display.screen_size))
+        pygame.event.clear()
+        # Act
+        start = time.perf_counter_ns()
+        result = self.game_for_test._get_events()
+        waited = (time.perf_counter_ns() - start) // 1_000_000
+        # Assert
+        self.assertEqual(result, [])
+        self.assertGreaterEqual(waited, 19)
+
+    def test__get_events_event_driven_new_mode(self):
+        # Arrange
+        old_mode = ModeTestEventDrivenLong()
+        old_mode.draw(pygame.Surface(display.screen_size))
+        old_mode.next_mode = ModeTestEventDrivenLong()
+        self.game_for_test.current_mode = old_mode.next_mode
+        self.game_for_test.current_mode.invalidate()
+        pygame.event.clear()
+        # Act
+        start = time.perf_counter_ns()
+        result = self.game_for_test._get_events()
+        waited = (time.perf_counter_ns() - start) // 1_000_000
+        draw_result = self.game_for_test.current_mode.draw(pygame.Surface(display.screen_size))
+        # Assert
+        self.assertEqual(result, [])
+        self.assertLess(waited, 300)
+        self.assertEqual(self.game_for_test._wait_time, 0)
+        self.assertIsNone(draw_result)
+        self.assertFalse(self.game_for_test.current_mode.is_draw_pending())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -49,6 +49,9 @@ class TestSpriteCollideMask(GameSprite):
     _COLLISION_MASK_LOCATION = './assets/gfx/32x32_image.png'
     _COLLISION_MASK_ALPHA_OR_COLORKEY = (255, 0, 255)
 
+class TestSpriteCollideMaskPyramid(TestSpriteCollideMask):
+    _COLLISION_MASK_PYRAMID = True
+
 class TestGameSprite(unittest.TestCase):
     IMAGE_POINTS = (
         (0, 0),
@@ -89,6 +92,27 @@ class TestGameSprite(unittest.TestCase):
         # Assert
         self.assertEqual(TestSpriteC.get_collides_with(), frozenset(('TestSpriteA',)))
 
+    def test_get_collide_functions_TestSpriteA(self):
+        # Assert
+        self.assertEqual(TestSpriteA.get_collide_functions(), {})
+
+    def test_get_collide_functions_TestSpriteC(self):
+        # Assert
+        self.assertEqual(TestSpriteC.get_collide_functions(), {'TestSpriteA': TestSpriteC.collide_TestSpriteA})
+
+    def test_collision_bits_TestSpriteB(self):
+        # Assert
+        self.assertEqual(TestSpriteB.collision_bits & TestSpriteA.collision_bits, TestSpriteA.collision_bits)
+        self.assertEqual(TestSpriteB.collision_bits & GameSprite.collision_bits, GameSprite.collision_bits)
+        self.assertFalse(TestSpriteA.collision_bits & TestSpriteC.collision_bits & ~GameSprite.collision_bits)
+
+    def test_collides_with_bits_TestSpriteC(self):
+        # Assert
+        self.assertEqual(TestSpriteA.collides_with_bits, 0)
+        self.assertTrue(TestSpriteC.collides_with_bits & TestSpriteA.collision_bits)
+        self.assertTrue(TestSpriteC.collides_with_bits & TestSpriteB.collision_bits)
+        self.assertFalse(TestSpriteC.collides_with_bits & TestSpriteD.collision_bits)
+
     def test_does_collide_circle_false(self):
         # Arrange
         left = TestSpriteCircle(center=(2.5, 3))
@@ -400,6 +424,48 @@ class TestGameSprite(unittest.TestCase):
         # Assert
         self.assertFalse(does_collide)
 
+    def test_does_collide_mask_pyramid(self):
+        # Arrange
+        offsets = [
+            (x, y)
+            for x in range(-34, 35, 3)
+            for y in range(-34, 35, 5)
+        ]
+        # Act
+        results = [
+            bool(TestSpriteCollideMaskPyramid(topleft=(0, 0)).does_collide(TestSpriteMask(topleft=offset)))
+            for offset
+            in offsets
+        ]
+        # Assert
+        expected = [
+            bool(TestSpriteCollideMask(topleft=(0, 0)).does_collide(TestSpriteMask(topleft=offset)))
+            for offset
+            in offsets
+        ]
+        self.assertEqual(results, expected)
+
+    def test_does_collide_mask_pyramid_both(self):
+        # Arrange
+        offsets = [
+            (x, y)
+            for x in range(-33, 34, 3)
+            for y in range(-33, 34, 4)
+        ]
+        # Act
+        results = [
+            bool(TestSpriteCollideMaskPyramid(topleft=(0, 0)).does_collide(TestSpriteCollideMaskPyramid(topleft=offset)))
+            for offset
+            in offsets
+        ]
+        # Assert
+        expected = [
+            bool(TestSpriteCollideMask(topleft=(0, 0)).does_collide(TestSpriteCollideMask(topleft=offset)))
+            for offset
+            in offsets
+        ]
+        self.assertEqual(results, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -45,6 +45,20 @@ class TestLoad(unittest.TestCase):
             expected = file.read()
         self.assertEqual(mask_result, expected)
 
+    def test_mask_coarse(self):
+        # Arrange
+        mask = load.mask_circle((31, 29), 12)
+        factor = 8
+        # Act
+        coarse = load.mask_coarse(mask, factor)
+        # Assert
+        self.assertEqual(coarse.get_size(), (4, 4))
+        block = load.mask_filled((factor, factor))
+        for y in range(4):
+            for x in range(4):
+                expected = 1 if mask.overlap(block, (x * factor, y * factor)) else 0
+                self.assertEqual(coarse.get_at((x, y)), expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,120 @@
 import unittest
 import os
+import tempfile
 
 import pygame
 
+from jovialengine.gamesprite import GameSprite
+from jovialengine.inputframe import InputFrame
+import jovialengine.narrowphase as narrowphase
 from mode import ModeTest
 
 
+collide_log = []
+
+
+class CollideSprite(GameSprite):
+    _IMAGE_LOCATION = './assets/gfx/4x4_image.png'
+    _ALPHA_OR_COLORKEY = (255, 0, 255)
+
+    def collide_CollideSprite(self, other):
+        collide_log.append((self.rect.topleft, other.rect.topleft))
+
+
+class CollideSpriteCircle(CollideSprite):
+    _COLLISION_RADIUS = 1.5
+
+
+class CollideSpriteChild(CollideSprite):
+    pass
+
+
+class CollideSpriteFast(CollideSprite):
+    _COLLISION_EVERY_STEP = True
+
+
+class CollideSpriteAsleep(CollideSprite):
+    _STARTS_ASLEEP = True
+
+
+class HookSprite(GameSprite):
+    _IMAGE_LOCATION = './assets/gfx/4x4_image.png'
+    _ALPHA_OR_COLORKEY = (255, 0, 255)
+
+    def collide_enter_CollideSprite(self, other):
+        collide_log.append(('enter', other.rect.topleft))
+
+    def collide_stay_CollideSprite(self, other):
+        collide_log.append(('stay', other.rect.topleft))
+
+    def collide_exit_CollideSprite(self, other):
+        collide_log.append(('exit', other.rect.topleft))
+
+
+class MaskSprite(CollideSprite):
+    _COLLISION_MASK_LOCATION = './assets/gfx/4x4_image.png'
+    _COLLISION_MASK_ALPHA_OR_COLORKEY = (255, 0, 255)
+
+
+class WallSprite(GameSprite):
+    _IMAGE_LOCATION = './assets/gfx/4x4_image.png'
+    _ALPHA_OR_COLORKEY = (255, 0, 255)
+
+    def static_collide_wall(self):
+        collide_log.append(('wall', self.rect.topleft))
+
+
+class IgnoredSprite(GameSprite):
+    _IMAGE_LOCATION = './assets/gfx/4x4_image.png'
+    _ALPHA_OR_COLORKEY = (255, 0, 255)
+
+
+class ModeTestCellSize(ModeTest):
+    _COLLISION_CELL_SIZE = 4
+
+
+class ModeTestSweepAxis(ModeTest):
+    _COLLISION_SWEEP_AXIS = 0
+
+
+class ModeTestFinalStepOnly(ModeTest):
+    _COLLISION_FINAL_STEP_ONLY = True
+
+
+class ModeTestStatic(ModeTest):
+    _STATIC_COLLISION_MASK_INFOS = (
+        ('wall', './assets/gfx/2560x1440_mask.png', (255, 0, 255)),
+    )
+
+
+class ModeTestVectorizeCircles(ModeTest):
+    _COLLISION_VECTORIZE_CIRCLES = True
+
+
+class ModeTestStats(ModeTest):
+    _COLLISION_STATS = True
+
+
+class ModeTestCellSizeStats(ModeTestCellSize):
+    _COLLISION_STATS = True
+
+
+class ModeTestDirtyRects(ModeTest):
+    _DIRTY_RECTS = True
+
+
+class ModeTestRedrawOnChange(ModeTest):
+    _REDRAW_ON_CHANGE = True
+
+
+class ModeTestInterpolateSprites(ModeTest):
+    _INTERPOLATE_SPRITES = True
+
+
+class ModeTestChunkedBackground(ModeTest):
+    _BACKGROUND_CHUNK_SIZE = 3
+
+
 class TestModeBase(unittest.TestCase):
     DRAW_EXPECTED = "WWWWWb" + os.linesep \
                    + "WrrrrW" + os.linesep \
@@ -85,6 +194,435 @@ class TestModeBase(unittest.TestCase):
         draw_result = self.get_surface_string(screen)
         self.assertEqual(draw_result, self.DRAW_EXPECTED)
 
+    def test_draw_chunked_background(self):
+        # Arrange
+        screen = pygame.Surface((6, 6))
+        screen.fill(pygame.Color('white'))
+        mode = ModeTestChunkedBackground((3, 3))
+        mode._camera.topleft = (1, 2)
+        # Act
+        mode.draw(screen)
+        # Assert
+        draw_result = self.get_surface_string(screen)
+        self.assertEqual(draw_result, self.DRAW_EXPECTED)
+        self.assertEqual(mode._background.get_chunk_count(), 1)
+
+    def test_stream(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            background_chunk = pygame.Surface((4, 4))
+            background_chunk.fill(pygame.Color('white'))
+            pygame.image.save(background_chunk, os.path.join(directory, 'background_1_0.png'))
+            mask_chunk = pygame.Surface((4, 4))
+            mask_chunk.fill((255, 0, 255))
+            mask_chunk.set_at((3, 3), pygame.Color('black'))
+            pygame.image.save(mask_chunk, os.path.join(directory, 'mask_0_0.png'))
+            mode_cls = type('ModeTestStream', (ModeTest,), {
+                '_STREAM_CHUNK_SIZE': 4,
+                '_STREAM_MARGIN': 0,
+                '_STREAM_BACKGROUND': os.path.join(directory, 'background_{x}_{y}.png'),
+                '_STATIC_COLLISION_MASK_INFOS': (
+                    ('wall', os.path.join(directory, 'mask_{x}_{y}.png'), (255, 0, 255)),
+                ),
+            })
+            mode = mode_cls((3, 3))
+            WallSprite(topleft=(2, 2)).start(mode)
+            WallSprite(topleft=(4, 0)).start(mode)
+            screen = pygame.Surface((6, 6))
+            screen.fill(pygame.Color('white'))
+            collide_log.clear()
+            # Act
+            mode.update(0)
+            mode._camera.topleft = (1, 2)
+            mode.draw(screen)
+            chunk_count = mode._background.get_chunk_count()
+            mode.cleanup()
+        # Assert
+        self.assertEqual(collide_log, [('wall', (2, 2))])
+        self.assertEqual(screen.get_at((4, 1)), pygame.Color('white'))
+        self.assertEqual(screen.get_at((1, 1)), pygame.Color('red'))
+        self.assertEqual(screen.get_at((2, 4)), pygame.Color('black'))
+        self.assertEqual(chunk_count, 2)
+        self.assertEqual(mode._background.get_chunk_count(), 1)
+
+    def test_draw_dirty_rects(self):
+        # Arrange
+        screen = pygame.Surface((6, 6))
+        screen.fill(pygame.Color('white'))
+        mode = ModeTestDirtyRects((3, 3))
+        mode._camera.topleft = (1, 2)
+        first_result = mode.draw(screen)
+        # Act
+        unchanged_result = mode.draw(screen)
+        mode.sprites_all.sprites()[0].rect.topleft = (2, 4)
+        moved_result = mode.draw(screen)
+        mode.invalidate((0, 0, 2, 2))
+        invalidated_result = mode.draw(screen)
+        mode.invalidate()
+        full_result = mode.draw(screen)
+        # Assert
+        expected_screen = pygame.Surface((6, 6))
+        expected_screen.fill(pygame.Color('white'))
+        expected_mode = ModeTest((2, 4))
+        expected_mode._camera.topleft = (1, 2)
+        expected_mode.draw(expected_screen)
+        self.assertIsNone(first_result)
+        self.assertEqual(unchanged_result, [])
+        self.assertEqual(moved_result, [pygame.Rect(2, 3, 1, 1), pygame.Rect(3, 2, 1, 1)])
+        self.assertEqual(invalidated_result, [pygame.Rect(0, 0, 2, 2)])
+        self.assertIsNone(full_result)
+        self.assertEqual(self.get_surface_string(screen), self.get_surface_string(expected_screen))
+
+    def test_draw_redraw_on_change(self):
+        # Arrange
+        screen = pygame.Surface((6, 6))
+        mode = ModeTestRedrawOnChange((3, 3))
+        first_result = mode.draw(screen)
+        # Act
+        unchanged_result = mode.draw(screen)
+        mode.input([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a)], InputFrame([], [], []))
+        input_result = mode.draw(screen)
+        mode.input([], InputFrame([], [], []))
+        no_input_result = mode.draw(screen)
+        mode.sprites_all.sprites()[0].rect.topleft = (2, 4)
+        moved_result = mode.draw(screen)
+        mode._camera.topleft = (1, 2)
+        camera_result = mode.draw(screen)
+        mode.invalidate((0, 0, 2, 2))
+        invalidated_result = mode.draw(screen)
+        final_result = mode.draw(screen)
+        # Assert
+        self.assertIsNone(first_result)
+        self.assertEqual(unchanged_result, [])
+        self.assertIsNone(input_result)
+        self.assertEqual(no_input_result, [])
+        self.assertIsNone(moved_result)
+        self.assertIsNone(camera_result)
+        self.assertIsNone(invalidated_result)
+        self.assertEqual(final_result, [])
+
+    def test_invalidate_untracked(self):
+        # Arrange
+        screen = pygame.Surface((6, 6))
+        mode = ModeTest((3, 3))
+        # Act
+        mode.invalidate((0, 0, 2, 2))
+        mode.invalidate((2, 2, 2, 2))
+        result = mode.draw(screen)
+        # Assert
+        self.assertIsNone(result)
+        self.assertEqual(mode._dirty_rects, [])
+
+    def test_is_draw_pending(self):
+        # Arrange
+        screen = pygame.Surface((6, 6))
+        mode = ModeTest((3, 3))
+        # Act
+        new_result = mode.is_draw_pending()
+        mode.draw(screen)
+        drawn_result = mode.is_draw_pending()
+        mode.invalidate()
+        invalidated_result = mode.is_draw_pending()
+        # Assert
+        self.assertTrue(new_result)
+        self.assertFalse(drawn_result)
+        self.assertTrue(invalidated_result)
+
+    def test_draw_interpolate_sprites(self):
+        # Arrange
+        screen = pygame.Surface((6, 6))
+        screen.fill(pygame.Color('white'))
+        mode = ModeTestInterpolateSprites((0, 0))
+        sprite = mode.sprites_all.sprites()[0]
+        mode.update(10)
+        sprite.rect.topleft = (2, 2)
+        # Act
+        result = mode.draw(screen, 0.5)
+        # Assert
+        expected_screen = pygame.Surface((6, 6))
+        expected_screen.fill(pygame.Color('white'))
+        ModeTest((1, 1)).draw(expected_screen)
+        self.assertIsNone(result)
+        self.assertEqual(sprite.rect.topleft, (2, 2))
+        self.assertEqual(self.get_surface_string(screen), self.get_surface_string(expected_screen))
+
+    @staticmethod
+    def get_collide_log(mode: ModeTest):
+        collide_log.clear()
+        for x in range(5):
+            for y in range(3):
+                CollideSprite(topleft=(x * 3, y * 2)).start(mode)
+                CollideSpriteCircle(topleft=(x * 2.5, y * 3.5)).start(mode)
+        mode.update(0)
+        return list(collide_log)
+
+    def test_collisions_rect_batches(self):
+        # Arrange
+        mode = ModeTest()
+        CollideSprite(topleft=(0, 0)).start(mode)
+        CollideSpriteChild(topleft=(2, 1)).start(mode)
+        CollideSprite(topleft=(3, 3)).start(mode)
+        MaskSprite(topleft=(5, 2)).start(mode)
+        CollideSpriteChild(topleft=(20, 0)).start(mode)
+        CollideSpriteCircle(topleft=(1, 4)).start(mode)
+        CollideSprite(topleft=(22, 2)).start(mode)
+        CollideSpriteChild(topleft=(21, 3)).start(mode)
+        collide_log.clear()
+        # Act
+        mode.update(0)
+        # Assert
+        # same order as checking every pair of sprites one at a time, in the order they were added
+        self.assertEqual(collide_log, [
+            ((0, 0), (2, 1)), ((2, 1), (0, 0)),
+            ((0, 0), (3, 3)), ((3, 3), (0, 0)),
+            ((2, 1), (3, 3)), ((3, 3), (2, 1)),
+            ((2, 1), (1, 4)), ((1, 4), (2, 1)),
+            ((3, 3), (5, 2)), ((5, 2), (3, 3)),
+            ((3, 3), (1, 4)), ((1, 4), (3, 3)),
+            ((20, 0), (22, 2)), ((22, 2), (20, 0)),
+            ((20, 0), (21, 3)), ((21, 3), (20, 0)),
+            ((22, 2), (21, 3)), ((21, 3), (22, 2)),
+        ])
+        for position, other_position in collide_log:
+            self.assertNotEqual(position, other_position)
+
+    def test_collisions_cell_size(self):
+        # Arrange
+        expected = self.get_collide_log(ModeTest())
+        # Act
+        result = self.get_collide_log(ModeTestCellSize())
+        # Assert
+        self.assertTrue(result)
+        self.assertEqual(result, expected)
+
+    def test_collisions_sweep_axis(self):
+        # Arrange
+        expected = self.get_collide_log(ModeTest())
+        # Act
+        result = self.get_collide_log(ModeTestSweepAxis())
+        # Assert
+        self.assertTrue(result)
+        self.assertEqual(result, expected)
+
+    @unittest.skipUnless(narrowphase.can_vectorize(), "requires numpy")
+    def test_collisions_vectorize_circles(self):
+        # Arrange
+        expected = self.get_collide_log(ModeTest())
+        # Act
+        result = self.get_collide_log(ModeTestVectorizeCircles())
+        # Assert
+        self.assertTrue(result)
+        self.assertEqual(result, expected)
+
+    def test_collisions_final_step_only(self):
+        # Arrange
+        mode = ModeTestFinalStepOnly()
+        CollideSprite(topleft=(0, 0)).start(mode)
+        CollideSprite(topleft=(1, 0)).start(mode)
+        CollideSpriteFast(topleft=(10, 0)).start(mode)
+        CollideSprite(topleft=(11, 0)).start(mode)
+        collide_log.clear()
+        # Act
+        mode.update(0, False)
+        step_result = list(collide_log)
+        collide_log.clear()
+        mode.update(0)
+        final_step_result = list(collide_log)
+        # Assert
+        self.assertEqual(step_result, [((10, 0), (11, 0)), ((11, 0), (10, 0))])
+        self.assertEqual(len(final_step_result), 4)
+
+    def test_collisions_asleep(self):
+        # Arrange
+        mode = ModeTest()
+        sprite0 = CollideSpriteAsleep(topleft=(0, 0)).start(mode)
+        CollideSpriteAsleep(topleft=(1, 0)).start(mode)
+        collide_log.clear()
+        # Act
+        mode.update(0)
+        asleep_result = list(collide_log)
+        CollideSprite(topleft=(4, 0)).start(mode)
+        collide_log.clear()
+        mode.update(0)
+        awake_result = list(collide_log)
+        sprite0.rect.x = 1
+        collide_log.clear()
+        mode.update(0)
+        moved_result = list(collide_log)
+        # Assert
+        self.assertEqual(asleep_result, [])
+        self.assertEqual(awake_result, [((1, 0), (4, 0)), ((4, 0), (1, 0))])
+        self.assertFalse(sprite0.is_asleep)
+        self.assertEqual(len(moved_result), 6)
+
+    def test_collisions_hooks(self):
+        # Arrange
+        mode = ModeTest()
+        HookSprite(topleft=(0, 0)).start(mode)
+        other = CollideSprite(topleft=(2, 0)).start(mode)
+        collide_log.clear()
+        # Act
+        mode.update(0)
+        mode.update(0)
+        other.rect.x = 4
+        mode.update(0)
+        mode.update(0)
+        # Assert
+        self.assertEqual(HookSprite.get_collides_with(), frozenset())
+        self.assertEqual(collide_log, [('enter', (2, 0)), ('stay', (2, 0)), ('exit', (4, 0))])
+
+    def test_collisions_cache(self):
+        # Arrange
+        mode = ModeTest()
+        sprite0 = MaskSprite(topleft=(2, 2)).start(mode)
+        MaskSprite(topleft=(4, 0)).start(mode)
+        collide_log.clear()
+        # Act
+        mode.update(0)
+        first_result = list(collide_log)
+        collide_log.clear()
+        mode.update(0)
+        second_result = list(collide_log)
+        sprite0.rect.x = -3
+        collide_log.clear()
+        mode.update(0)
+        moved_result = list(collide_log)
+        # Assert
+        self.assertEqual(len(mode._collide_cache), 1)
+        self.assertEqual(len(first_result), 2)
+        self.assertEqual(second_result, first_result)
+        self.assertEqual(moved_result, [])
+
+    def test_collision_stats(self):
+        # Arrange
+        mode = ModeTestStats()
+        CollideSprite(topleft=(0, 0)).start(mode)
+        CollideSprite(topleft=(2, 0)).start(mode)
+        MaskSprite(topleft=(20, 0)).start(mode)
+        CollideSpriteCircle(topleft=(40, 0)).start(mode)
+        IgnoredSprite(topleft=(1, 0)).start(mode)
+        # Act
+        mode.update(0)
+        mode.update(0)
+        # Assert
+        stats = mode.collision_stats
+        self.assertIsNone(ModeTest().collision_stats)
+        self.assertEqual(stats.steps, 2)
+        self.assertEqual(stats.pairs_considered, 12)
+        self.assertEqual(stats.pairs_filtered, 0)
+        self.assertEqual(stats.rect_checks, 2)
+        self.assertEqual(stats.mask_checks, 10)
+        self.assertEqual(stats.circle_checks, 0)
+        self.assertEqual(stats.hits, 2)
+
+    def test_collision_stats_filtered_reset(self):
+        # Arrange
+        mode = ModeTestCellSizeStats()
+        HookSprite(topleft=(0, 0)).start(mode)
+        HookSprite(topleft=(1, 0)).start(mode)
+        CollideSprite(topleft=(20, 20)).start(mode)
+        mode.update(0)
+        filtered = mode.collision_stats.pairs_filtered
+        # Act
+        mode.collision_stats.reset()
+        # Assert
+        self.assertEqual(filtered, 1)
+        self.assertEqual(mode.collision_stats.as_dict(), dict.fromkeys(mode.collision_stats.as_dict(), 0))
+
+    @staticmethod
+    def get_query_mode():
+        mode = ModeTestStatic()
+        sprites = (
+            CollideSprite(topleft=(0, 0)).start(mode),
+            IgnoredSprite(topleft=(10, 0)).start(mode),
+            CollideSprite(topleft=(100, 40)).start(mode),
+            IgnoredSprite(topleft=(300, 300)).start(mode),
+        )
+        return mode, sprites
+
+    def test_query_rect(self):
+        # Arrange
+        mode, sprites = self.get_query_mode()
+        # Act
+        result = mode.query_rect((2, 0, 10, 2))
+        labelled_result = mode.query_rect((2, 0, 10, 2), 'IgnoredSprite')
+        # Assert
+        self.assertEqual(result, [sprites[0], sprites[1]])
+        self.assertEqual(labelled_result, [sprites[1]])
+
+    def test_query_point(self):
+        # Arrange
+        mode, sprites = self.get_query_mode()
+        # Act
+        result = mode.query_point((102, 42))
+        # Assert
+        self.assertEqual(result, [sprites[2]])
+
+    def test_query_radius(self):
+        # Arrange
+        mode, sprites = self.get_query_mode()
+        sprites[3].rect.topleft = (106, 40)
+        mode.update(0)
+        # Act
+        result = mode.query_radius((105, 30), 10.5)
+        # Assert
+        self.assertEqual(result, [sprites[2], sprites[3]])
+
+    def test_query_rect_removed_and_moved(self):
+        # Arrange
+        mode, sprites = self.get_query_mode()
+        mode.query_rect((0, 0, 20, 20))
+        # Act
+        sprites[0].kill()
+        sprites[1].rect.topleft = (200, 200)
+        result = mode.query_rect((0, 0, 20, 20))
+        raycast_result = mode.raycast((0, 1), (20, 1))
+        # Assert
+        self.assertEqual(result, [sprites[1]])
+        self.assertEqual(raycast_result, (sprites[1], (10.0, 1.0)))
+
+    def test_raycast_sprite(self):
+        # Arrange
+        mode, sprites = self.get_query_mode()
+        # Act
+        result = mode.raycast((20, 1), (0, 1))
+        labelled_result = mode.raycast((20, 1), (0, 1), 'CollideSprite')
+        # Assert
+        self.assertEqual(result, (sprites[1], (13.0, 1.0)))
+        self.assertEqual(labelled_result, (sprites[0], (3.0, 1.0)))
+
+    def test_raycast_static(self):
+        # Arrange
+        mode, sprites = self.get_query_mode()
+        # Act
+        result = mode.raycast((50, 110), (300, 110))
+        missed_result = mode.raycast((50, 10), (300, 10))
+        # Assert
+        self.assertEqual(result, ('wall', (106, 110)))
+        self.assertIsNone(missed_result)
+
+    def test_collisions_class_interests(self):
+        # Arrange
+        mode = ModeTest()
+        collide_log.clear()
+        # Act
+        IgnoredSprite(topleft=(0, 0)).start(mode)
+        CollideSprite(topleft=(1, 0)).start(mode)
+        IgnoredSprite(topleft=(2, 0)).start(mode)
+        CollideSpriteChild(topleft=(3, 0)).start(mode)
+        mode.update(0)
+        # Assert
+        self.assertEqual(
+            set(mode._collide_interests),
+            {
+                (CollideSprite, CollideSprite),
+                (CollideSprite, CollideSpriteChild),
+                (CollideSpriteChild, CollideSprite),
+                (CollideSpriteChild, CollideSpriteChild),
+            }
+        )
+        self.assertEqual(collide_log, [((1, 0), (3, 0)), ((3, 0), (1, 0))])
+
     def test_cleanup(self):
         # Arrange
         mode = ModeTest()
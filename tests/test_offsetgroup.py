@@ -0,0 +1,55 @@
+import unittest
+
+import pygame
+
+from jovialengine.offsetgroup import OffsetGroup
+
+
+class TestOffsetGroup(unittest.TestCase):
+    @staticmethod
+    def get_group():
+        group = OffsetGroup()
+        for pos in ((0, 0), (3, 0), (4.6, 4)):
+            sprite = pygame.sprite.Sprite()
+            sprite.image = pygame.Surface((2, 2))
+            sprite.image.fill(pygame.Color('white'))
+            sprite.rect = sprite.image.get_frect(topleft=pos)
+            group.add(sprite)
+        return group
+
+    def test_draw_offset(self):
+        # Arrange
+        group = self.get_group()
+        surface = pygame.Surface((8, 8))
+        # Act
+        group.draw_offset(surface, (1, 1))
+        # Assert
+        self.assertEqual(surface.get_at((1, 1)), pygame.Color('white'))
+        self.assertEqual(surface.get_at((4, 1)), pygame.Color('white'))
+        self.assertEqual(surface.get_at((6, 5)), pygame.Color('white'))
+
+    def test_draw_offset_camera(self):
+        # Arrange
+        group = self.get_group()
+        surface = pygame.Surface((8, 8))
+        # Act
+        group.draw_offset(surface, (1, 1), (1.4, 0, 3, 3))
+        # Assert
+        self.assertEqual(surface.get_at((1, 1)), pygame.Color('white'))
+        self.assertEqual(surface.get_at((4, 1)), pygame.Color('white'))
+        self.assertEqual(surface.get_at((6, 5)), pygame.Color('black'))
+
+    def test_draw_offset_camera_rounding(self):
+        # Arrange
+        group = self.get_group()
+        surface = pygame.Surface((8, 8))
+        # Act
+        group.draw_offset(surface, (1, 1), (1.6, 0, 3, 3))
+        # Assert
+        self.assertEqual(surface.get_at((1, 1)), pygame.Color('black'))
+        self.assertEqual(surface.get_at((4, 1)), pygame.Color('white'))
+        self.assertEqual(surface.get_at((6, 5)), pygame.Color('black'))
+
+
+if __name__ == '__main__':
+    unittest.main()
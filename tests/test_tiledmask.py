@@ -0,0 +1,89 @@
+import unittest
+
+import pygame
+
+from jovialengine.tiledmask import TiledMask
+import jovialengine.load as load
+
+
+class TestTiledMask(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.display.set_mode((1, 1), pygame.NOFRAME)
+
+    @staticmethod
+    def get_mask():
+        mask_image = load.image('./assets/gfx/2560x1440_mask.png', (255, 0, 255))
+        return load.mask_surface(mask_image)
+
+    def test_get_at(self):
+        # Arrange
+        mask = self.get_mask()
+        # Act
+        tiled_mask = TiledMask(mask, 48)
+        # Assert
+        for pos in ((0, 0), (100, 100), (200, 200), (2559, 1439), (1000, 700), (47, 48)):
+            self.assertEqual(tiled_mask.get_at(pos), mask.get_at(pos))
+
+    def test_overlap(self):
+        # Arrange
+        mask = self.get_mask()
+        tiled_mask = TiledMask(mask, 48)
+        other = load.mask_circle((32, 32), 16)
+        positions = [
+            (x, y)
+            for x in range(60, 130, 3)
+            for y in range(60, 130, 3)
+        ] + [(-40, -40), (2550, 1430), (1000, 700)]
+        # Act
+        results = [
+            tiled_mask.overlap(other, pos) is not None
+            for pos in positions
+        ]
+        # Assert
+        expected = [
+            other.overlap(mask, (-pos[0], -pos[1])) is not None
+            for pos in positions
+        ]
+        self.assertEqual(results, expected)
+        self.assertIn(True, results)
+        self.assertIn(False, results)
+
+    def test_overlap_full(self):
+        # Arrange
+        mask = pygame.Mask((100, 50), fill=True)
+        tiled_mask = TiledMask(mask, 16)
+        other = load.mask_circle((8, 8), 4)
+        # Act
+        inside = tiled_mask.overlap(other, (90, 40))
+        outside = tiled_mask.overlap(other, (100, 20))
+        corner = tiled_mask.overlap(other, (-7, -7))
+        # Assert
+        self.assertIsNotNone(inside)
+        self.assertIsNone(outside)
+        self.assertIsNone(corner)
+
+    def test_raycast(self):
+        # Arrange
+        mask = pygame.Mask((200, 100))
+        mask.set_at((150, 50))
+        mask.set_at((30, 90))
+        tiled_mask = TiledMask(mask, 16)
+        # Act
+        hit_result = tiled_mask.raycast((0, 50.5), (199, 50.5))
+        reverse_result = tiled_mask.raycast((199, 50.5), (-50, 50.5))
+        diagonal_result = tiled_mask.raycast((-60, 0), (60, 120))
+        missed_result = tiled_mask.raycast((0, 10.5), (199, 10.5))
+        outside_result = tiled_mask.raycast((-10, -10), (300, -10))
+        short_result = tiled_mask.raycast((0, 50.5), (199, 50.5), 100)
+        # Assert
+        self.assertEqual(hit_result, (150, 50))
+        self.assertEqual(reverse_result, (150, 50))
+        self.assertEqual(diagonal_result, (30, 90))
+        self.assertIsNone(missed_result)
+        self.assertIsNone(outside_result)
+        self.assertIsNone(short_result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import threading
+import time
+
+import pygame
+
+from jovialengine.worldstream import WorldStream
+
+
+class TestWorldStream(unittest.TestCase):
+    @staticmethod
+    def get_stream(margin: int, memory_budget: int):
+        loaded = dict()
+        stream = WorldStream((64, 32), 8, margin, memory_budget)
+        stream.add_layer(
+            lambda chunk_pos: pygame.Mask((8, 8), True),
+            loaded.__setitem__,
+            loaded.__delitem__
+        )
+        return stream, loaded
+
+    def test_update_loads_area(self):
+        # Arrange
+        stream, loaded = self.get_stream(0, 1024)
+        # Act
+        stream.update((4, 4, 8, 8))
+        # Assert
+        self.assertEqual(sorted(loaded), [(0, 0), (0, 1), (1, 0), (1, 1)])
+        self.assertEqual(stream.get_memory_used(), 4 * 8)
+
+    def test_update_loads_margin(self):
+        # Arrange
+        stream, loaded = self.get_stream(8, 1024)
+        # Act
+        stream.update((16, 8, 8, 8))
+        for _ in range(100):
+            if len(loaded) == 9:
+                break
+            time.sleep(0.01)
+            stream.update((16, 8, 8, 8))
+        # Assert
+        self.assertEqual(len(loaded), 9)
+        self.assertTrue(stream.is_loaded(0, (1, 0)))
+        self.assertTrue(stream.is_loaded(0, (3, 2)))
+        stream.stop()
+
+    def test_update_evicts(self):
+        # Arrange
+        stream, loaded = self.get_stream(0, 2 * 8)
+        stream.update((0, 0, 8, 8))
+        stream.update((8, 0, 8, 8))
+        # Act
+        stream.update((16, 0, 8, 8))
+        # Assert
+        self.assertEqual(sorted(loaded), [(1, 0), (2, 0)])
+
+    def test_stop(self):
+        # Arrange
+        stream, loaded = self.get_stream(0, 1024)
+        stream.update((0, 0, 16, 16))
+        # Act
+        stream.stop()
+        # Assert
+        self.assertEqual(loaded, dict())
+        self.assertEqual(stream.get_memory_used(), 0)
+
+    def test_stop_while_loading(self):
+        # Arrange
+        loading = threading.Event()
+
+        def load_chunk(chunk_pos):
+            if threading.current_thread() is not threading.main_thread():
+                loading.set()
+                time.sleep(0.05)
+            return pygame.Mask((8, 8), True)
+        stream = WorldStream((64, 32), 8, 8, 1024)
+        stream.add_layer(load_chunk, lambda chunk_pos, data: None, lambda chunk_pos: None)
+        stream.update((16, 8, 8, 8))
+        thread = stream._thread
+        self.assertTrue(loading.wait(1))
+        # Act
+        stream.stop()
+        # Assert
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(stream._results.empty())
+        self.assertEqual(stream.get_memory_used(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()